@@ -1,3 +1,13 @@
+# This is from https://dspy.ai/tutorials/llms_txt_generation/ 
+import logging
+import re
+from functools import lru_cache
+import dspy
+import utils
+from typing import List, Dict, Any
+
+log = logging.getLogger(__name__)
+
 # Example: New agent to process a custom flow
 class MyStepSignature(dspy.Signature):
     """Signature for a custom step in the flow."""
@@ -13,12 +23,6 @@ class MyFlowAgent(dspy.Module):
     def forward(self, input_data):
         step1_result = self.step1(input_data=input_data)
         return step1_result.output_data
-# This is from https://dspy.ai/tutorials/llms_txt_generation/ 
-import dspy
-from pathlib import Path
-from typing import List
-import utils
-from typing import List, Dict, Any
 
 class AnalyzeRepository(dspy.Signature):
     """Analyze a repository structure and identify key components."""
@@ -52,18 +56,86 @@ class GenerateLLMsTxt(dspy.Signature):
 
     llms_txt_content: str = dspy.OutputField(desc="Complete llms.txt file content following the standard format")
 
+class AnalyzeAndGenerateLLMsTxt(dspy.Signature):
+    """Analyze a repository and generate a comprehensive llms.txt file for it in one pass."""
+    repo_url: str = dspy.InputField(desc="GitHub repository URL")
+    file_tree: str = dspy.InputField(desc="Repository file structure")
+    readme_content: str = dspy.InputField(desc="README content")
+    package_files: str = dspy.InputField(desc="Key package and configuration files")
+
+    project_purpose: str = dspy.OutputField(desc="Main purpose and goals of the project")
+    key_concepts: list[str] = dspy.OutputField(desc="List of important concepts and terminology")
+    architecture_overview: str = dspy.OutputField(desc="High-level architecture description")
+    important_directories: list[str] = dspy.OutputField(desc="Key directories and their purposes")
+    entry_points: list[str] = dspy.OutputField(desc="Main entry points and important files")
+    development_info: str = dspy.OutputField(desc="Development setup and workflow information")
+    usage_examples: str = dspy.OutputField(desc="Common usage patterns and examples")
+    llms_txt_content: str = dspy.OutputField(desc="Complete llms.txt file content following the standard format")
+
+# Prompt size caps for RepositoryAnalyzer; cost and latency grow with input tokens
+MAX_TREE_ENTRIES = 500
+MAX_README_CHARS = 20000
+
+def _summarize_tree(file_tree: str, max_entries: int = MAX_TREE_ENTRIES) -> str:
+    """Bound a newline-separated file tree to about max_entries paths.
+
+    Keeps every path up to two levels deep, then fills the remaining budget
+    with an evenly spaced sample of the deeper paths so every area of the
+    repository stays represented.
+    """
+    paths = file_tree.splitlines()
+    if len(paths) <= max_entries:
+        return file_tree
+    shallow = [p for p in paths if p.count("/") < 2][:max_entries]
+    deep = [p for p in paths if p.count("/") >= 2]
+    budget = max_entries - len(shallow)
+    step = len(deep) / budget if budget else 0
+    sampled = [deep[int(i * step)] for i in range(budget)]
+    kept = sorted(shallow + sampled)
+    return "\n".join(kept) + f"\n...[{len(paths) - len(kept)} more paths omitted]"
+
+def _truncate(text: str, limit: int = MAX_README_CHARS) -> str:
+    """Cut text to limit characters, marking the cut."""
+    return text if len(text) <= limit else text[:limit] + "\n...[truncated]"
+
 class RepositoryAnalyzer(dspy.Module):
-    def __init__(self):
+    """Generate llms.txt for a repository.
+
+    By default the analysis and llms.txt generation run as a single LLM call.
+    Pass fine_grained=True to run the original four-stage pipeline, which is
+    slower but easier to inspect step by step.
+    """
+
+    def __init__(self, fine_grained=False):
         super().__init__()
-        self.analyze_repo = dspy.ChainOfThought(AnalyzeRepository)
-        self.analyze_structure = dspy.ChainOfThought(AnalyzeCodeStructure)
-        self.generate_examples = dspy.ChainOfThought("repo_info -> usage_examples")
-        self.generate_llms_txt = dspy.ChainOfThought(GenerateLLMsTxt)
+        self.fine_grained = fine_grained
+        if fine_grained:
+            self.analyze_repo = dspy.ChainOfThought(AnalyzeRepository)
+            self.analyze_structure = dspy.ChainOfThought(AnalyzeCodeStructure)
+            self.generate_examples = dspy.ChainOfThought("repo_info -> usage_examples")
+            self.generate_llms_txt = dspy.ChainOfThought(GenerateLLMsTxt)
+        else:
+            self.analyze_all = dspy.ChainOfThought(AnalyzeAndGenerateLLMsTxt)
 
     def forward(self, repo_url, file_tree, readme_content, package_files):
+        log.debug("file_tree len=%d readme len=%d", len(file_tree), len(readme_content))
+        file_tree = _summarize_tree(file_tree)
+        readme_content = _truncate(readme_content)
+
+        if not self.fine_grained:
+            result = self.analyze_all(
+                repo_url=repo_url,
+                file_tree=file_tree,
+                readme_content=readme_content,
+                package_files=package_files
+            )
+            return dspy.Prediction(
+                llms_txt_content=result.llms_txt_content,
+                analysis=result,
+                structure=result
+            )
+
         # Analyze repository purpose and concepts
-        print(len(file_tree))
-        print(len(readme_content))
         repo_analysis = self.analyze_repo(
             repo_url=repo_url,
             file_tree=file_tree,
@@ -120,6 +192,56 @@ class CodeGenerator(dspy.Signature):
     best_practices: list[str] = dspy.OutputField(desc="Best practices and tips")
     imports_needed: list[str] = dspy.OutputField(desc="Required imports and dependencies")
 
+# Words that don't change what a use case asks for, e.g. "Basic setup" vs
+# "basic setup of FastAPI"
+_USE_CASE_STOPWORDS = frozenset(
+    {"a", "an", "and", "the", "of", "for", "with", "to", "in", "on", "using", "use", "how"}
+)
+
+
+def _normalize_use_case(library_name: str, use_case: str) -> tuple:
+    """Reduce a free-text use case to its lowercased words, minus stopwords and
+    the library's own name (which is already part of the cache key).
+
+    Word order is kept: "read JSON, write CSV" and "read CSV, write JSON" ask
+    for different code.
+    """
+    ignored = _USE_CASE_STOPWORDS | set(re.findall(r"\w+", library_name.lower()))
+    return tuple(w for w in re.findall(r"\w+", use_case.lower()) if w not in ignored)
+
+
+def _format_library_info(library_info: Dict) -> str:
+    """Format library information for the code generator.
+
+    library_info is the first input of CodeGenerator, so keeping this text
+    byte-identical across use cases lets the provider reuse the cached prompt
+    prefix; only the use case and requirements that follow it change.
+    """
+    return _format_library_fields(
+        library_info['library'],
+        tuple(library_info['core_concepts']),
+        tuple(library_info['patterns']),
+        tuple(library_info['methods']),
+        library_info['installation'],
+        # First 3 examples
+        tuple(library_info['examples'][:3]),
+    )
+
+
+@lru_cache(maxsize=32)
+def _format_library_fields(library, core_concepts, patterns, methods, installation, examples) -> str:
+    # Memoized on the field values rather than stored on library_info, so the
+    # caller's dict stays as it was and a later edit to it is picked up
+    return "\n".join([
+        f"Library: {library}",
+        f"Core Concepts: {', '.join(core_concepts)}",
+        f"Common Patterns: {', '.join(patterns)}",
+        f"Key Methods: {', '.join(methods)}",
+        f"Installation: {installation}",
+        f"Example Code Snippets: {'; '.join(examples)}",
+    ])
+
+
 class DocumentationLearningAgent(dspy.Module):
     """Agent that learns from documentation URLs and generates code examples."""
 
@@ -131,6 +253,8 @@ class DocumentationLearningAgent(dspy.Module):
         self.refine_code = dspy.ChainOfThought(
             "code, feedback -> improved_code: str, changes_made: list[str]"
         )
+        # (library, normalized use case, requirements) -> generated example
+        self._example_cache = {}
 
     def learn_from_urls(self, library_name: str, doc_urls: list[str]) -> Dict:
         """Learn about a library from its documentation URLs."""
@@ -167,29 +291,33 @@ class DocumentationLearningAgent(dspy.Module):
         }
 
     def generate_example(self, library_info: Dict, use_case: str, requirements: str = "") -> Dict:
-        """Generate a code example for a specific use case."""
-
-        # Format library information for the generator
-        info_text = f"""
-        Library: {library_info['library']}
-        Core Concepts: {', '.join(library_info['core_concepts'])}
-        Common Patterns: {', '.join(library_info['patterns'])}
-        Key Methods: {', '.join(library_info['methods'])}
-        Installation: {library_info['installation']}
-        Example Code Snippets: {'; '.join(library_info['examples'][:3])}  # First 3 examples
+        """Generate a code example for a specific use case.
+
+        Use cases that only differ in wording (case, filler words, repeating the
+        library name) reuse the earlier generation instead of calling the LLM.
         """
+        library_name = library_info['library']
+        cache_key = (
+            library_name.lower(),
+            _normalize_use_case(library_name, use_case),
+            requirements.strip(),
+        )
+        if cache_key in self._example_cache:
+            return dict(self._example_cache[cache_key])
 
         code_result = self.generate_code(
-            library_info=info_text,
+            library_info=_format_library_info(library_info),
             use_case=use_case,
             requirements=requirements
         )
 
-        return {
+        example = {
             "code": code_result.code_example,
             "explanation": code_result.explanation,
             "best_practices": code_result.best_practices,
             "imports": code_result.imports_needed
         }
+        self._example_cache[cache_key] = example
+        return dict(example)
 
 
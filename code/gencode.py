@@ -3,6 +3,22 @@ import docanalyzer as d
 import os
 import dspy
 import openai   
+import json
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding when installed
+    orjson = None
+
+
+def save_json(data, filename):
+    """Write data to filename as indented JSON, using orjson when available."""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
 
 def interactive_learning_session(agent):
     """Interactive session for learning libraries with user input."""
@@ -118,9 +134,7 @@ def interactive_learning_session(agent):
                     filename = f"{library_name.lower()}_learning.json"
 
                 try:
-                    import json
-                    with open(filename, 'w') as f:
-                        json.dump(result, f, indent=2, default=str)
+                    save_json(result, filename)
                     print(f"   ✅ Results saved to {filename}")
                 except Exception as e:
                     print(f"   ❌ Error saving file: {e}")
@@ -160,7 +174,7 @@ def run_example(agent):
     fastapi_examples = d.generate_examples_for_library(agent,fastapi_info, "FastAPI")
     library_name = "FastAPI"
     use_cases = [ex['use_case'] for ex in fastapi_examples]
-    result = d.learn_any_library(agent,library_name, fastapi_urls, use_cases)
+    result = d.learn_any_library(agent,library_name, fastapi_urls, use_cases, precomputed_info=fastapi_info)
     if result:
             
             print(f"\n✅ Successfully learned {library_name}!")
@@ -194,6 +208,8 @@ if __name__ == "__main__":
     openai.api_key = key
     lm = dspy.LM("openai/gpt-4o-mini",api_key=key)
     dspy.settings.configure(lm=lm)
+    # Persist LM responses so re-runs with identical prompts skip the API call
+    dspy.configure_cache(enable_disk_cache=True, disk_cache_dir=".dspy_cache")
     # Run interactive session
     #learned_libraries = interactive_learning_session()
     # Initialize the learning agent
@@ -1,9 +1,7 @@
 import re
 import openai
 import dspy
-from dspy.teleprompt import BootstrapFewShot
 
-from markitdown import MarkItDown
 import os
 import dspyanalysis as g
 from dotenv import load_dotenv
@@ -12,13 +10,15 @@ import sys
 import utils
 
 
-def generate_llms_txt_for_dspy(gurl,lm):
+def generate_llms_txt_for_dspy(gurl,lm,prefetched=None):
     # Initialize our analyzer
     analyzer = g.RepositoryAnalyzer()
 
-    # Gather DSPy repository information
+    # Gather DSPy repository information, unless the caller already did
     repo_url = gurl
-    file_tree, readme_content, package_files = utils.gather_repository_info(repo_url)
+    if prefetched is None:
+        prefetched = utils.gather_repository_info(repo_url)
+    file_tree, readme_content, package_files = prefetched[:3]
 
     # Generate llms.txt
     result = analyzer(
@@ -37,13 +37,15 @@ if __name__ == "__main__":
     openai.api_key = key
     lm = dspy.LM("openai/gpt-4o-mini",api_key=key)
     dspy.settings.configure(lm=lm)
+    # Persist LM responses so re-runs with identical prompts skip the API call
+    dspy.configure_cache(enable_disk_cache=True, disk_cache_dir=".dspy_cache")
     url="https://github.com/electrum/tpch-dbgen"
     file_tree_txt, readme_content, package_files_content, combined_tags = utils.gather_repository_info(url)
     print(combined_tags)
     exit(1)
     #url="https://github.com/stanfordnlp/dspy"
     try:
-        result = generate_llms_txt_for_dspy(url,lm)
+        result = generate_llms_txt_for_dspy(url,lm,prefetched=(file_tree_txt, readme_content, package_files_content))
 
     # Save the generated llms.txt
         with open("llms.txt", "w") as f:
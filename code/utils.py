@@ -28,36 +28,193 @@ def create_svg_visualization(data: dict) -> str:
         svg.append(f'  <circle cx="{cx}" cy="{cy}" r="{r}" fill="{color}" />')
     svg.append('</svg>')
     return '\n'.join(svg)
+import bisect
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import shelve
 import shutil
 import subprocess
+import tempfile
+import threading
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import html2text
 from typing import List, Dict, Any
 import json
 from urllib.parse import urljoin, urlparse
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:  # selectolax < 0.3.13 ships only the Modest backend
+        from selectolax.parser import HTMLParser
+    except ImportError:  # optional: C-based HTML parsing, much faster than bs4
+        HTMLParser = None
+
+# optional: lxml is a C-based bs4 tree builder, faster than html.parser
+BS4_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+log = logging.getLogger(__name__)
+
+# Page elements dropped before converting documentation pages to markdown
+NON_CONTENT_TAGS = ["script", "style", "nav", "footer", "header"]
+
+# {sha1(url): (result, etag, last_modified, fetched_at)} of converted
+# documentation pages, kept across runs
+DOC_CACHE_PATH = os.path.join(tempfile.gettempdir(), "dspytools_docfetch")
+# Seconds a cached documentation page is served without revalidating
+DOC_CACHE_TTL = 3600
+# Documentation pages larger than this are skipped rather than parsed
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+PACKAGE_FILES = ["pyproject.toml", "setup.py", "requirements.txt", "package.json"]
+
+CPP_EXTENSIONS = {".cpp", ".cc", ".cxx", ".h", ".hpp", ".hh", ".hxx"}
+
+# gather_repository_info results as {tree_sha}.json, kept across runs
+REPO_INFO_CACHE_DIR = os.path.join(tempfile.gettempdir(), "dspytools_repo_info")
+
+# {url: (etag, body, encoding, fetched_at)} for conditional GitHub requests,
+# kept across runs
+ETAG_CACHE_PATH = os.path.join(tempfile.gettempdir(), "dspytools_github_cache")
+# Seconds a cached GitHub response is served without revalidating
+GITHUB_CACHE_TTL = 3600
+# Below this many remaining GitHub API calls, requests wait for the reset
+RATE_LIMIT_FLOOR = 10
+
+_github_session = None
+_etag_lock = threading.Lock()
+_doc_cache_lock = threading.Lock()
+
+# Branch each repository's tree was fetched from (main or master), keyed by
+# (owner, repo), so file fetches can address raw content directly
+_repo_branches = {}
+# Tree sha of each repository's last fetched tree, keyed by (owner, repo);
+# it changes whenever any file does, so it keys the repository info cache
+_repo_tree_shas = {}
+# {(repo_url, tree_sha): gather_repository_info result} for this process
+_repo_info_memo = {}
+
+
+def _respect_rate_limit(response, *args, **kwargs):
+    """Response hook: once the GitHub budget runs low, wait for it to reset."""
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_FLOOR:
+        return
+    wait = int(reset) - time.time()
+    if wait > 0:
+        log.warning(
+            "GitHub rate limit nearly exhausted (%s left), sleeping %.0fs until reset",
+            remaining,
+            wait,
+        )
+        time.sleep(wait)
+
+
+def get_github_session():
+    """Return the shared GitHub API session, created on first use.
+
+    Created lazily so the token is read after entrypoints call load_dotenv().
+    The token comes from GITHUB_ACCESS_TOKEN, GITHUB_TOKEN or GH_TOKEN; with
+    none set, requests go out unauthenticated instead of with an empty bearer.
+    """
+    global _github_session
+    if _github_session is None:
+        session = requests.Session()
+        token = (
+            os.environ.get("GITHUB_ACCESS_TOKEN")
+            or os.environ.get("GITHUB_TOKEN")
+            or os.environ.get("GH_TOKEN")
+        )
+        if token:
+            session.headers["Authorization"] = f"Bearer {token}"
+        else:
+            log.warning(
+                "no GITHUB_ACCESS_TOKEN, GITHUB_TOKEN or GH_TOKEN set; "
+                "GitHub requests are unauthenticated (60/hour)"
+            )
+        # Keep connections alive across calls and concurrent workers
+        # and retry transient failures, honouring Retry-After on 429/503
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.hooks["response"].append(_respect_rate_limit)
+        _github_session = session
+    return _github_session
+
+
+def _cached_response(url, body, encoding):
+    """Build a 200 response carrying a body from the ETag cache."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = encoding
+    response._content = body
+    return response
+
+
+def github_get(url, accept=None):
+    """GET a GitHub URL, revalidating with the ETag of the last successful fetch.
+
+    Responses younger than GITHUB_CACHE_TTL are served from the cache without
+    a request. Older ones are revalidated; an unchanged resource comes back as
+    a bodyless 304 and the cached body is served instead, so callers always
+    see a normal 200. accept selects a media type; each one is cached apart.
+    """
+    cache_key = f"{url} {accept}" if accept else url
+    with _etag_lock, shelve.open(ETAG_CACHE_PATH) as cache:
+        cached = cache.get(cache_key)
+    if cached:
+        etag, body, encoding, fetched_at = cached
+        if time.time() - fetched_at < GITHUB_CACHE_TTL:
+            return _cached_response(url, body, encoding)
+    headers = {"Accept": accept} if accept else {}
+    if cached:
+        headers["If-None-Match"] = etag
+    response = get_github_session().get(url, headers=headers)
+    if response.status_code == 304 and cached:
+        response = _cached_response(url, body, encoding)
+    elif response.status_code == 200 and response.headers.get("ETag"):
+        etag = response.headers["ETag"]
+    else:
+        return response
+    with _etag_lock, shelve.open(ETAG_CACHE_PATH) as cache:
+        cache[cache_key] = (etag, response.content, response.encoding, time.time())
+    return response
+
+
 def get_url(owner, repo, branch="main"):
     try:
         api_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1"
 
-        response = requests.get(
-            api_url,
-            headers={
-                "Authorization": f"Bearer {os.environ.get('GITHUB_ACCESS_TOKEN')}"
-            },
-        )
+        response = github_get(api_url)
         if response.status_code != 200:
             raise Exception(f"Failed to fetch repository tree: {response.status_code}")
     except Exception as e:
-        print(branch)
+        log.debug("tree fetch for %s/%s failed on branch %s: %s", owner, repo, branch, e)
         if branch == "main":
             return get_url(owner, repo, branch="master")
         else:
             raise e
 
+    _repo_branches[(owner, repo)] = branch
     return response
 
 
@@ -69,6 +226,7 @@ def get_github_file_tree(repo_url):
     response = get_url(owner, repo)
     if response.status_code == 200:
         tree_data = response.json()
+        _repo_tree_shas[(owner, repo)] = tree_data.get("sha")
         file_paths = [
             item["path"] for item in tree_data["tree"] if item["type"] == "blob"
         ]
@@ -78,60 +236,169 @@ def get_github_file_tree(repo_url):
 
 
 def get_github_file_content(repo_url, file_path):
-    """Get specific file content from GitHub."""
+    """Get specific file content from GitHub.
+
+    Once the repository's branch is known (from get_github_file_tree), the file
+    is read from raw.githubusercontent.com, which returns the bytes directly
+    instead of base64 inside JSON. The contents API remains the fallback.
+    """
     parts = repo_url.rstrip("/").split("/")
     owner, repo = parts[-2], parts[-1]
 
+    branch = _repo_branches.get((owner, repo))
+    if branch is not None:
+        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{file_path}"
+        response = github_get(raw_url)
+        if response.status_code == 200:
+            return response.text
+        if response.status_code == 404:
+            return f"Could not fetch {file_path}"
+
     api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{file_path}"
-    response = requests.get(
-        api_url,
-        headers={"Authorization": f"Bearer {os.environ.get('GITHUB_ACCESS_TOKEN')}"},
-    )
+    # The raw media type returns the file itself rather than base64 in JSON
+    response = github_get(api_url, accept="application/vnd.github.raw")
 
     if response.status_code == 200:
-        import base64
-
-        content = base64.b64decode(response.json()["content"]).decode("utf-8")
-        return content
+        return response.content.decode("utf-8", errors="replace")
     else:
         return f"Could not fetch {file_path}"
 
 
-def gather_repository_info(repo_url):
-    """Gather all necessary repository information."""
-    file_tree = get_github_file_tree(repo_url)
-    matches = []
-    for s in file_tree:
-        if "README" in s:
-            matches.append(s)
-    readme_content = ""
-    if len(matches) > 0:
-        readme_content = get_github_file_content(repo_url, matches[0])
-    # Get key package files
-    package_files = []
-    for file_path in ["pyproject.toml", "setup.py", "requirements.txt", "package.json"]:
-        try:
-            content = get_github_file_content(repo_url, file_path)
+def _fetch_file_content(repo_url, file_path):
+    """Like get_github_file_content, but report network errors as a failed fetch."""
+    try:
+        return get_github_file_content(repo_url, file_path)
+    except Exception:
+        return f"Could not fetch {file_path}"
+
+
+def _fetch_files_via_api(repo_url, paths):
+    """Fetch paths concurrently over the GitHub API; return {path: content} of hits."""
+    get_github_session()  # create the shared session before workers use it
+    contents = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(_fetch_file_content, repo_url, path): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            content = future.result()
             if "Could not fetch" not in content:
-                package_files.append(f"=== {file_path} ===\n{content}")
-        except:
+                contents[futures[future]] = content
+    return contents
+
+
+def _read_local_files(local_repo_path, paths):
+    """Read paths from a local checkout; return {path: content} of those present."""
+    contents = {}
+    for path in paths:
+        try:
+            with open(os.path.join(local_repo_path, path), encoding="utf-8") as f:
+                contents[path] = f.read()
+        except (OSError, UnicodeDecodeError):
             continue
+    return contents
+
+
+def gather_repository_info(repo_url):
+    """Gather all necessary repository information.
+
+    Results are memoized in-process and on disk under the repository's tree
+    sha, so an unchanged repository is neither cloned nor re-tagged.
+    """
+    file_tree = get_github_file_tree(repo_url)
+    parts = repo_url.rstrip("/").split("/")
+    tree_sha = _repo_tree_shas.get((parts[-2], parts[-1]))
+    if tree_sha is None:
+        return _gather_repository_info(repo_url, file_tree)[0]
+
+    memo_key = (repo_url, tree_sha)
+    if memo_key in _repo_info_memo:
+        return _repo_info_memo[memo_key]
+    cache_file = os.path.join(REPO_INFO_CACHE_DIR, f"{tree_sha}.json")
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            info = tuple(json.load(f))
+    except (OSError, ValueError):
+        info, complete = _gather_repository_info(repo_url, file_tree)
+        if not complete:
+            return info
+        os.makedirs(REPO_INFO_CACHE_DIR, exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+    _repo_info_memo[memo_key] = info
+    return info
+
+
+def _gather_repository_info(repo_url, file_tree):
+    """Return (info, complete); complete is False when the clone or ctags failed."""
+    # Only a root-level README describes the project as a whole
+    readme_path = next(
+        (s for s in file_tree if "/" not in s and s.upper().startswith("README")),
+        None,
+    )
+    # file_tree is sorted, so present package files are found by bisection
+    # and absent ones never cost a request
+    candidates = [path for path in PACKAGE_FILES if _in_sorted(file_tree, path)]
+    if readme_path:
+        candidates.append(readme_path)
+
+    # The clone is needed for ctags anyway, so read README and package files
+    # from it; the per-file API round-trips are only a fallback. Only the
+    # root-level files and directories holding C++ sources are checked out.
+    sparse_dirs = {os.path.dirname(f) for f in _cpp_files(file_tree)} - {""}
+    try:
+        local_repo_path = clone_repo_to_tmp(repo_url, sparse_dirs)
+    except (subprocess.CalledProcessError, OSError) as e:
+        log.warning("clone of %s failed, falling back to the API: %s", repo_url, e)
+        local_repo_path = None
+
+    if local_repo_path is not None:
+        contents = _read_local_files(local_repo_path, candidates)
+    else:
+        contents = _fetch_files_via_api(repo_url, candidates)
+
+    readme_content = contents.get(readme_path, "") if readme_path else ""
+    # Get key package files, in PACKAGE_FILES order regardless of arrival
+    package_files = [
+        f"=== {file_path} ===\n{contents[file_path]}"
+        for file_path in PACKAGE_FILES
+        if file_path in contents
+    ]
 
     package_files_content = "\n\n".join(package_files)
-    file_tree_txt = "\n".join(sorted(file_tree))
+    # get_github_file_tree already returns the paths sorted
+    file_tree_txt = "\n".join(file_tree)
+
+    combined_tags = (
+        collect_cpp_ctags(local_repo_path, file_tree) if local_repo_path else ""
+    )
+
+    info = (file_tree_txt, readme_content, package_files_content, combined_tags)
+    # Empty tags for a tree with C++ sources mean ctags was missing or failed;
+    # a later run with a working ctags should not be served that result
+    complete = local_repo_path is not None and (
+        bool(combined_tags) or not _cpp_files(file_tree)
+    )
+    return info, complete
 
-    combined_tags = collect_cpp_ctags(repo_url, file_tree)
 
-    return file_tree_txt, readme_content, package_files_content, combined_tags
+def _in_sorted(sorted_paths, path):
+    i = bisect.bisect_left(sorted_paths, path)
+    return i < len(sorted_paths) and sorted_paths[i] == path
 
 
-def clone_repo_to_tmp(repo_url: str) -> str:
+def _cpp_files(file_tree):
+    return [f for f in file_tree if os.path.splitext(f)[1].lower() in CPP_EXTENSIONS]
+
+
+def clone_repo_to_tmp(repo_url: str, sparse_dirs=None) -> str:
     """
     Clone the given GitHub repo into /tmp and return the local path.
-    """
-    import subprocess
-    import re
 
+    With sparse_dirs, only the root-level files and those directories are
+    checked out, and blobs outside them are never downloaded.
+    """
     repo_name = repo_url.rstrip("/").split("/")[-1]
     local_path = f"/tmp/{repo_name}"
     # Remove if already exists
@@ -142,88 +409,284 @@ def clone_repo_to_tmp(repo_url: str) -> str:
         clone_url = repo_url
     else:
         clone_url = repo_url + ".git"
-    subprocess.run(["git", "clone", "--depth", "1", clone_url, local_path], check=True)
+    if sparse_dirs is None:
+        subprocess.run(["git", "clone", "--depth", "1", clone_url, local_path], check=True)
+        return local_path
+
+    subprocess.run(
+        ["git", "clone", "--depth", "1", "--filter=blob:none", "--no-checkout",
+         clone_url, local_path],
+        check=True,
+    )
+    subprocess.run(
+        ["git", "-C", local_path, "sparse-checkout", "set", "--cone", "--stdin"],
+        input="\n".join(sorted(sparse_dirs)), text=True, check=True,
+    )
+    subprocess.run(["git", "-C", local_path, "checkout"], check=True)
     return local_path
 
 
-def collect_cpp_ctags(repo_url, file_tree) -> str:
+def collect_cpp_ctags(local_repo_path, file_tree) -> str:
     """
-    Iterate over C++ files in root_dir, generate ctags for each, and collect all tags into a single string.
+    Generate ctags for the C++ files of file_tree in the cloned repository at local_repo_path and collect all tags into a single string.
+
+    A single ctags process reads the whole file list from stdin (-L -).
     """
-    cpp_extensions = {".cpp", ".cc", ".cxx", ".h", ".hpp", ".hh", ".hxx"}
-    tags_output = []
-    local_repo_path = clone_repo_to_tmp(repo_url)
-    for filename in file_tree:
-        ext = os.path.splitext(filename)[1].lower()
-        if ext in cpp_extensions:
-            local_file_path = os.path.join(local_repo_path, filename)
-            if os.path.exists(local_file_path):
-                try:
-                    print(f"Generating ctags for {local_file_path}")
-                    result = subprocess.run([
-                            'ctags', '-f', '-', '--fields=+n', local_file_path
-                        ], capture_output=True, text=True, check=True)
-                    tags_output.append(result.stdout)
-                except subprocess.CalledProcessError as e:
-                    print(f"ctags failed for {local_file_path}: {e}")
-            else:
-                # fallback: fetch and save to /tmp as before
-                file_content = get_github_file_content(repo_url, filename)
-                tmp_file_path = os.path.basename(filename)
-                with open(tmp_file_path, "w", encoding="utf-8") as tmp_file:
-                    tmp_file.write(file_content)
-                    try:
-                        result = subprocess.run([
-                            'ctags', '-f', '-', '--fields=+n', tmp_file_path
-                        ], capture_output=True, text=True, check=True)
-                    tags_output.append(result.stdout)
-                except subprocess.CalledProcessError as e:
-                    print(f"ctags failed for {tmp_file_path}: {e}")
-            finally:
-                    os.remove(tmp_file_path)
-    return "".join(tags_output)
+    paths = [os.path.join(local_repo_path, f) for f in _cpp_files(file_tree)]
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        return ""
+    print(f"Generating ctags for {len(paths)} files")
+    try:
+        result = subprocess.run(
+            ['ctags', '-f', '-', '--fields=+n', '-L', '-'],
+            input="\n".join(paths) + "\n", capture_output=True, text=True, check=True,
+        )
+    except (subprocess.CalledProcessError, OSError) as e:
+        # OSError: no ctags binary; the rest of the repository info still holds
+        print(f"ctags failed for {local_repo_path}: {e}")
+        return ""
+    return result.stdout
+
+
+def strip_non_content(content: bytes) -> tuple[str | None, str]:
+    """Return (title, html) of a page with NON_CONTENT_TAGS removed, using bs4.
+
+    This is the fallback for when selectolax is not installed; with it,
+    pages go through _selectolax_markdown instead.
+    """
+    soup = BeautifulSoup(content, BS4_PARSER)
+    for tag in soup.select(", ".join(NON_CONTENT_TAGS)):
+        tag.decompose()
+    # get_text() gives a plain str; .string would pin the whole tree
+    return (soup.title.get_text() if soup.title else None), str(soup)
+
+
+class UnfetchablePage(Exception):
+    """A documentation URL that retrying will not help: too large or not text."""
+
+
+def _read_capped(response, limit):
+    """Read a streamed response body, raising UnfetchablePage past limit bytes."""
+    declared = response.headers.get("Content-Length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        response.close()
+        raise UnfetchablePage(f"page is {declared} bytes, limit is {limit}")
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        body += chunk
+        if len(body) > limit:
+            response.close()
+            raise UnfetchablePage(f"page exceeds {limit} bytes")
+    return bytes(body)
+
+
+def _new_html_converter() -> html2text.HTML2Text:
+    converter = html2text.HTML2Text()
+    converter.ignore_links = False
+    converter.ignore_images = True
+    return converter
+
+
+# Per-process converter for parse-pool workers, built by _init_parse_worker;
+# each worker handles one page at a time, so reusing it is safe
+_worker_converter = None
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _init_parse_worker():
+    global _worker_converter
+    _worker_converter = _new_html_converter()
+
+
+# Block elements followed by a paragraph break / a line break in page text
+_PARAGRAPH_TAGS = (
+    "p, div, section, article, pre, blockquote, table, ul, ol, dl, "
+    "h1, h2, h3, h4, h5, h6"
+)
+_LINE_TAGS = "li, tr, br, dt, dd"
+_BLANK_RUN_RE = re.compile(r"(?:[ \t]*\n){3,}")
+# Comments and script/style elements, matched left to right like the HTML
+# tokenizer so a "<!--" inside a script (or "<script" inside a comment) is
+# not mistaken for the start of the other
+_RAW_NOISE_RE = re.compile(
+    rb"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+
+
+def _selectolax_markdown(content: bytes) -> tuple[str | None, str]:
+    """Return (title, text) of a page with headings, list items and links kept
+    in markdown form; a cheap stand-in for html2text."""
+    tree = HTMLParser(content)
+    title_node = tree.css_first("title")
+    title = title_node.text() if title_node else None
+    tree.strip_tags(NON_CONTENT_TAGS)
+    for link in tree.css("a[href]"):
+        text = link.text(strip=True)
+        link.replace_with(f"[{text}]({link.attributes['href']})" if text else "")
+    for heading in tree.css("h1, h2, h3, h4, h5, h6"):
+        heading.insert_before("#" * int(heading.tag[1]) + " ")
+    for item in tree.css("li"):
+        item.insert_before("- ")
+    for cell in tree.css("td, th"):
+        cell.insert_after(" ")
+    for node in tree.css(_LINE_TAGS):
+        node.insert_after("\n")
+    for node in tree.css(_PARAGRAPH_TAGS):
+        node.insert_after("\n\n")
+    root = tree.body or tree.root
+    text = root.text(separator="", strip=False) if root else ""
+    return title, _BLANK_RUN_RE.sub("\n\n", text).strip() + "\n"
+
+
+def _parse_page(content: bytes) -> tuple[str | None, str]:
+    """Return (title, markdown) of an HTML page; runs in a parse-pool worker."""
+    # Inline scripts and styles are often most of a page's bytes; dropping
+    # them before parsing keeps them out of the tree altogether
+    content = _RAW_NOISE_RE.sub(b"", content)
+    if HTMLParser is not None:
+        return _selectolax_markdown(content)
+    title, html = strip_non_content(content)
+    # Convert to markdown for better LLM processing
+    converter = _worker_converter or _new_html_converter()
+    return title, converter.handle(html)
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Return the shared page-parsing process pool, created on first use.
+
+    Workers are spawned rather than forked because the pool is first used
+    from fetch threads, and forking a multi-threaded process is unsafe.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_parse_worker,
+            )
+    return _parse_pool
 
 
 class DocumentationFetcher:
     """Fetches and processes documentation from URLs."""
 
-    def __init__(self, max_retries=3, delay=1):
+    def __init__(
+        self,
+        max_retries=3,
+        delay=1,
+        max_workers=16,
+        per_host=4,
+        max_bytes=MAX_PAGE_BYTES,
+        cache_path=DOC_CACHE_PATH,
+        cache_ttl=DOC_CACHE_TTL,
+    ):
         self.session = requests.Session()
         self.session.headers.update(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
         )
+        # Pool sized to the worker count so concurrent fetches reuse connections
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.max_retries = max_retries
         self.delay = delay
-        self.html_converter = html2text.HTML2Text()
-        self.html_converter.ignore_links = False
-        self.html_converter.ignore_images = True
+        self.max_workers = max_workers
+        # At most this many requests in flight to any one host at a time
+        self.per_host = per_host
+        self.max_bytes = max_bytes
+        # Converted pages are cached on disk; cache_path=None disables it
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+
+    def _cache_get(self, key):
+        if self.cache_path is None:
+            return None
+        with _doc_cache_lock, shelve.open(self.cache_path) as cache:
+            return cache.get(key)
+
+    def _cache_put(self, key, result, etag, last_modified):
+        if self.cache_path is None:
+            return
+        with _doc_cache_lock, shelve.open(self.cache_path) as cache:
+            cache[key] = (result, etag, last_modified, time.time())
 
     def fetch_url(self, url: str) -> dict[str, str]:
-        """Fetch content from a single URL."""
+        """Fetch content from a single URL.
+
+        Converted pages are cached for cache_ttl seconds; after that they are
+        revalidated with the stored ETag / Last-Modified, and a 304 reuses the
+        cached markdown without parsing the page again.
+        """
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        cached = self._cache_get(key)
+        headers = {}
+        if cached:
+            result, etag, last_modified, fetched_at = cached
+            if time.time() - fetched_at < self.cache_ttl:
+                return result
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
         for attempt in range(self.max_retries):
             try:
                 print(f"📡 Fetching: {url} (attempt {attempt + 1})")
-                response = self.session.get(url, timeout=10)
+                response = self.session.get(
+                    url, timeout=10, headers=headers, stream=True
+                )
+                if response.status_code == 304 and cached:
+                    response.close()
+                    self._cache_put(key, result, etag, last_modified)
+                    return result
                 response.raise_for_status()
 
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # Remove script and style elements
-                for script in soup(["script", "style", "nav", "footer", "header"]):
-                    script.decompose()
-
-                # Convert to markdown for better LLM processing
-                markdown_content = self.html_converter.handle(str(soup))
+                content_type = response.headers.get("Content-Type", "text/html")
+                if "html" not in content_type and not content_type.startswith("text/"):
+                    response.close()
+                    raise UnfetchablePage(f"unsupported content type {content_type}")
+                body = _read_capped(response, self.max_bytes)
+
+                if "html" in content_type:
+                    # Parsing is GIL-bound, so it runs in the process pool
+                    # while this thread's siblings keep downloading
+                    title, markdown_content = (
+                        _get_parse_pool().submit(_parse_page, body).result()
+                    )
+                else:
+                    # Plain text and markdown pages need no conversion
+                    title = None
+                    markdown_content = body.decode(
+                        response.encoding or "utf-8", errors="replace"
+                    )
 
-                return {
+                result = {
                     "url": url,
-                    "title": soup.title.string if soup.title else "No title",
+                    "title": title or "No title",
                     "content": markdown_content,
                     "success": True,
                 }
-
+                self._cache_put(
+                    key,
+                    result,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+                return result
+
+            except UnfetchablePage as e:
+                print(f"❌ Skipping {url}: {e}")
+                return {
+                    "url": url,
+                    "title": "Failed to fetch",
+                    "content": f"Error: {str(e)}",
+                    "success": False,
+                }
             except Exception as e:
                 print(f"❌ Error fetching {url}: {e}")
                 if attempt < self.max_retries - 1:
@@ -239,15 +702,25 @@ class DocumentationFetcher:
         return {"url": url, "title": "Failed", "content": "", "success": False}
 
     def fetch_documentation(self, urls: list[str]) -> list[dict[str, str]]:
-        """Fetch documentation from multiple URLs."""
-        results = []
+        """Fetch documentation from multiple URLs concurrently, preserving order.
+
+        Different hosts are fetched in parallel, but each host sees at most
+        per_host concurrent requests.
+        """
+        if not urls:
+            return []
 
-        for url in urls:
-            result = self.fetch_url(url)
-            results.append(result)
-            time.sleep(self.delay)  # Be respectful to servers
+        host_slots = {
+            host: threading.BoundedSemaphore(self.per_host)
+            for host in {urlparse(url).netloc for url in urls}
+        }
 
-        return results
+        def fetch(url):
+            with host_slots[urlparse(url).netloc]:
+                return self.fetch_url(url)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            return list(executor.map(fetch, urls))
 
 
 def learn_library_from_urls(
@@ -341,9 +814,17 @@ def generate_examples_for_library(agent, library_info: Dict, library_name: str):
 
 
 def learn_any_library(
-    agent, library_name: str, documentation_urls: list[str], use_cases: list[str] = None
+    agent,
+    library_name: str,
+    documentation_urls: list[str],
+    use_cases: list[str] = None,
+    precomputed_info: Dict = None,
 ):
-    """Learn any library from its documentation and generate examples."""
+    """Learn any library from its documentation and generate examples.
+
+    Pass ``precomputed_info`` (the result of an earlier ``learn_from_urls``)
+    to skip re-fetching and re-analyzing the documentation.
+    """
 
     if use_cases is None:
         use_cases = [
@@ -357,7 +838,10 @@ def learn_any_library(
 
     try:
         # Step 1: Learn from documentation
-        library_info = agent.learn_from_urls(library_name, documentation_urls)
+        if precomputed_info is not None:
+            library_info = precomputed_info
+        else:
+            library_info = agent.learn_from_urls(library_name, documentation_urls)
 
         # Step 2: Generate examples for each use case
         all_examples = []
@@ -8,6 +8,15 @@ from typing import List, Dict, Any
 import json
 from urllib.parse import urljoin, urlparse
 import time
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Upper bound on concurrent section drafts (LLM calls are network-bound)
+MAX_SECTION_WORKERS = 8
+
+# Wrappers models put around SVG output, compiled once for clean_svg
+_SVG_FENCE_RE = re.compile(r"^```(?:svg)?\s*(.*?)```$", re.DOTALL)
+_SVG_TRIPLE_QUOTE_RE = re.compile(r"^'''(?:svg)?(.*?)'''$", re.DOTALL)
 
 
 # --- Helper: Optional SVG Cleaner ---
@@ -24,14 +33,14 @@ def clean_svg(svg_text: str) -> str:
 
 	# Remove code fences (```svg ... ``` or ``` ... ```)
 	if cleaned.startswith("```"):
-		cleaned = re.sub(r"^```(?:svg)?\s*(.*?)```$", r"\1", cleaned, flags=re.DOTALL).strip()
+		cleaned = _SVG_FENCE_RE.sub(r"\1", cleaned).strip()
 
 	# Remove triple quotes wrapping SVG
-	if cleaned.startswith("'''svg") or cleaned.startswith("'''<svg"):
-		cleaned = re.sub(r"^'''(?:svg)?(.*?)'''$", r"\1", cleaned, flags=re.DOTALL).strip()
+	if cleaned.startswith(("'''svg", "'''<svg")):
+		cleaned = _SVG_TRIPLE_QUOTE_RE.sub(r"\1", cleaned).strip()
 
 	# Remove Markdown-style <svg> tags surrounded by extra quotes
-	if cleaned.startswith('"') or cleaned.startswith("'"):
+	if cleaned.startswith(('"', "'")):
 		cleaned = cleaned.strip('"\'').strip()
 
 	return cleaned
@@ -57,45 +66,149 @@ class DraftSection(dspy.Signature):
 	image: str = dspy.OutputField(desc="generate an image in svg that helps describe the section")
 
 
+class SelfConsistentDraftSection(dspy.Module):
+	"""Draft a section from several parallel samples and keep the most representative one.
+
+	All samples come from a single provider call (n completions), so they decode
+	concurrently and share the prompt prefix. The kept draft is the one most
+	similar to the others, the free-text analogue of a self-consistency vote.
+	"""
+	def __init__(self, n=4, temperature=0.7):
+		super().__init__()
+		self.draft = dspy.Predict(DraftSection, n=n, temperature=temperature)
+
+	def forward(self, **kwargs):
+		completions = self.draft(**kwargs).completions
+		contents = completions.content
+
+		def agreement(i):
+			return sum(
+				SequenceMatcher(None, contents[i], other).quick_ratio()
+				for j, other in enumerate(contents)
+				if j != i
+			)
+
+		best = max(range(len(contents)), key=agreement)
+		return dspy.Prediction(content=contents[best], image=completions.image[best])
+
+
+class DraftSections(dspy.Signature):
+	"""Draft several top-level sections of an article in one pass, keeping their order."""
+	topic: str = dspy.InputField()
+	section_specs: list[dict[str, Any]] = dspy.InputField(
+		desc="one {section_heading, section_subheadings} entry per section"
+	)
+	drafts: list[dict[str, str]] = dspy.OutputField(
+		desc="one {content, image} per spec, in order; content is a markdown-formatted "
+		"section and image an svg that helps describe it"
+	)
+
+
 class DraftArticle(dspy.Module):
-	def __init__(self):
+	def __init__(self, batch_sections=True):
 		self.build_outline = dspy.ChainOfThought(Outline)
-		self.draft_section = dspy.ChainOfThought(DraftSection)
+		self.draft_section = SelfConsistentDraftSection()
+		self.draft_sections = dspy.ChainOfThought(DraftSections)
+		self.batch_sections = batch_sections
 
 	def forward(self, topic):
 		outline = self.build_outline(topic=topic)
+		specs = self._section_specs(outline)
+		if not specs:
+			return dspy.Prediction(title=outline.title, sections=[])
+		drafts = None
+		if self.batch_sections:
+			drafts = self._draft_batched(outline.title, specs)
+		if drafts is None:
+			drafts = self._draft_concurrently(outline.title, specs)
 		sections = []
-		for heading, subheadings in outline.section_subheadings.items():
-			section_heading = f"## {heading}"
-			subheading_list = [f"### {s}" for s in subheadings]
-			section = self.draft_section(
-				topic=outline.title,
-				section_heading=section_heading,
-				section_subheadings=subheading_list,
-			)
+		for content, image in drafts:
 			# Apply cleaner to image
-			cleaned_image = clean_svg(section.image)
-			sections.append((section.content, cleaned_image))
+			cleaned_image = clean_svg(image)
+			sections.append((content, cleaned_image))
 		return dspy.Prediction(title=outline.title, sections=sections)
 
+	def stream(self, topic):
+		"""Outline the article, then draft its sections and yield each one as soon as it is ready.
+
+		Returns (title, sections) where sections is a generator of
+		(index, content, image) tuples in completion order; index is the
+		section's position in the outline, for callers that want to reorder.
+		"""
+		outline = self.build_outline(topic=topic)
+		return outline.title, self._iter_drafted(outline.title, self._section_specs(outline))
+
+	def _iter_drafted(self, title, specs):
+		if not specs:
+			return
+		with ThreadPoolExecutor(max_workers=min(MAX_SECTION_WORKERS, len(specs))) as executor:
+			futures = {
+				executor.submit(self.draft_section, topic=title, **spec): index
+				for index, spec in enumerate(specs)
+			}
+			for future in as_completed(futures):
+				section = future.result()
+				yield futures[future], section.content, clean_svg(section.image)
+
+	@staticmethod
+	def _section_specs(outline):
+		return [
+			{
+				"section_heading": f"## {heading}",
+				"section_subheadings": [f"### {s}" for s in subheadings],
+			}
+			for heading, subheadings in outline.section_subheadings.items()
+		]
+
+	def _draft_batched(self, title, specs):
+		"""Draft all sections with a single LLM call.
+
+		Returns None when the model does not return exactly one well-formed
+		draft per spec, so the caller can fall back to per-section calls.
+		"""
+		try:
+			drafts = self.draft_sections(topic=title, section_specs=specs).drafts
+		except Exception:
+			return None
+		if len(drafts) != len(specs):
+			return None
+		if not all(isinstance(d, dict) and "content" in d for d in drafts):
+			return None
+		return [(d["content"], d.get("image", "")) for d in drafts]
+
+	def _draft_concurrently(self, title, specs):
+		"""Draft each section with its own LLM call, running the calls concurrently."""
+		with ThreadPoolExecutor(max_workers=min(MAX_SECTION_WORKERS, len(specs))) as executor:
+			futures = [executor.submit(self.draft_section, topic=title, **spec) for spec in specs]
+			# Collect in submission order so sections keep the outline order
+			drafted = [future.result() for future in futures]
+		return [(section.content, section.image) for section in drafted]
+
 
 # --- Run the Model ---
 if __name__ == "__main__":
 	draft_article = DraftArticle()
 	topic = "The Future of Artificial Intelligence in Healthcare"
-	article = draft_article(topic=topic)
-	# Display if running in notebook
+	# Sections are shown as soon as each one is drafted, so they may arrive out
+	# of outline order; the printed section numbers follow the outline
+	title, sections = draft_article.stream(topic=topic)
+	# Display if running in notebook; decided once, before drafting starts, so
+	# errors raised while a section is drafted propagate instead of being
+	# taken for a display failure
 	try:
-		display(Markdown(f"# {article.title}"))
-		for i, (content, svg) in enumerate(article.sections, 1):
+		display(Markdown(f"# {title}"))
+		in_notebook = True
+	except Exception:
+		# Fallback to printing
+		in_notebook = False
+		print("Title:", title)
+	for i, content, svg in sections:
+		if in_notebook:
 			display(Markdown(content))
 			if svg:
 				display(HTML(svg))
-	except Exception:
-		# Fallback to printing
-		print("Title:", article.title)
-		for i, (content, svg) in enumerate(article.sections, 1):
-			print(f"\n--- Section {i} ---\n")
+		else:
+			print(f"\n--- Section {i + 1} ---\n")
 			print(content)
 			if svg:
 				print("[SVG content omitted; use a notebook to render]")
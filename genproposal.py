@@ -1,30 +1,71 @@
 import dspy
-import requests
-from bs4 import BeautifulSoup
+import numpy as np
 #import html2text
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 import json
-from urllib.parse import urljoin, urlparse
 import time
-import re
 from datetime import datetime
 import argparse
+import asyncio
 import sys
 import difflib
 import os
+import hashlib
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from itertools import count, islice
 
-lm = dspy.LM("openai/gpt-4o-mini")
+# The parser lives in its own module so it can be used without importing dspy
+from latexparser import LaTeXStructureParser, Paragraph
+
+try:
+    import ijson
+except ImportError:  # optional: stream large JSON inputs item by item
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding/decoding when installed
+    orjson = None
+
+LM_MODEL = "openai/gpt-4o-mini"
+
+
+def _prompt_cache_kwargs(model: str) -> Dict[str, Any]:
+    """dspy.LM kwargs that mark the system message (signature instructions) as cacheable.
+
+    OpenAI caches repeated prompt prefixes on its own; Anthropic-style
+    providers need explicit cache_control markers, which LiteLLM injects.
+    """
+    if model.startswith(("anthropic/", "bedrock/", "vertex_ai/claude")):
+        return {"cache_control_injection_points": [{"location": "message", "role": "system"}]}
+    return {}
+
+
+lm = dspy.LM(LM_MODEL, **_prompt_cache_kwargs(LM_MODEL))
 dspy.configure(lm=lm)
 
 
 # 1. Paragraph Versioning System
+# Versions are append-only within a session, so a counter identifies them uniquely
+_version_counter = count(1)
+
+
 class ParagraphVersion:
     """Store a single version of a paragraph with metadata."""
     def __init__(self, content: str, section_title: str = ""):
         self.content = content
         self.section_title = section_title
-        self.timestamp = datetime.now().isoformat()
-        self.version_id = hash((content, self.timestamp)) % 10000
+        # Raw nanoseconds are cheap to take; the ISO string is only built on access
+        self._ts_ns = time.time_ns()
+        self.version_id = next(_version_counter)
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self._ts_ns / 1e9).isoformat()
 
     def to_dict(self) -> Dict:
         return {
@@ -36,223 +77,197 @@ class ParagraphVersion:
 
 
 class ParagraphHistory:
-    """Track all versions of paragraphs in a proposal."""
-    def __init__(self):
+    """Track all versions of paragraphs in a proposal.
+
+    If `log_path` is given, every new version is also appended to that JSONL
+    file as it is added, so a session's history survives without rewriting
+    a full snapshot; `load_from_file` can replay such a log. The log only
+    covers versions not yet in a snapshot: it is emptied after each
+    successful `save_to_file`, and versions left in it by a session that
+    ended before saving are replayed on construction.
+    """
+    def __init__(self, log_path: Optional[str] = None):
         self.history: Dict[str, List[ParagraphVersion]] = {}
+        self._dirty = False  # unsaved versions since the last save/load
+        self._last_saved = None  # snapshot file the history was last saved to or loaded from
+        self.log_path = log_path
+        self._log = None  # opened on the first add_version
+        if log_path and os.path.exists(log_path) and os.path.getsize(log_path):
+            self.load_from_file(log_path)
+            self._dirty = True
 
     def add_version(self, section_title: str, content: str) -> None:
         """Add a new version of a paragraph."""
         if section_title not in self.history:
             self.history[section_title] = []
-        self.history[section_title].append(ParagraphVersion(content, section_title))
+        version = ParagraphVersion(content, section_title)
+        self.history[section_title].append(version)
+        self._dirty = True
+        if self.log_path:
+            if self._log is None:
+                self._log = open(self.log_path, "a", encoding="utf-8")
+            self._log.write(json.dumps(version.to_dict()) + "\n")
+            self._log.flush()
+
+    def close(self) -> None:
+        """Close the append-only log, if one is open."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
 
     def get_versions(self, section_title: str) -> List[Dict]:
         """Get all versions of a paragraph."""
         return [v.to_dict() for v in self.history.get(section_title, [])]
 
-    def save_to_file(self, filename: str = "paragraph_history.json") -> None:
-        """Save paragraph history to a JSON file."""
+    def save_to_file(self, filename: str = "paragraph_history.json", pretty: bool = False) -> None:
+        """Save paragraph history to a JSON file.
+
+        Nothing is written if no version was added since this same file was
+        last saved or loaded, so callers can save freely (e.g. once per run).
+        """
+        if not self._dirty and filename == self._last_saved and os.path.exists(filename):
+            return
         data = {section: [v.to_dict() for v in versions] for section, versions in self.history.items()}
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
+        save_json(data, filename, pretty)
+        self._dirty = False
+        self._last_saved = filename
+        # Everything logged is now in the snapshot, so the log starts over
+        if self.log_path and os.path.exists(self.log_path):
+            self.close()
+            open(self.log_path, "w").close()
 
     def load_from_file(self, filename: str = "paragraph_history.json") -> None:
-        """Load paragraph history from a JSON file."""
-        with open(filename, "r") as f:
-            data = json.load(f)
+        """Load paragraph history from a JSON snapshot or replay a .jsonl log."""
+        if filename.endswith(".jsonl"):
+            with open(filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        v = json.loads(line)
+                        self.history.setdefault(v["section"], []).append(ParagraphVersion(v["content"], v["section"]))
+        else:
+            data = load_json(filename)
             for section, versions in data.items():
                 self.history[section] = [ParagraphVersion(v["content"], section) for v in versions]
+            self._last_saved = filename
+        self._dirty = False
 
 
-# 2. LaTeX Structure Parser
-class LaTeXStructureParser:
-    """Parse LaTeX documents and extract structure."""
-    
-    @staticmethod
-    def parse_structure(latex_content: str) -> Dict[str, Any]:
-        """Extract structure from LaTeX content."""
-        structure = {
-            "title": LaTeXStructureParser._extract_title(latex_content),
-            "sections": LaTeXStructureParser._extract_sections(latex_content),
-            "subsections": LaTeXStructureParser._extract_subsections(latex_content),
-            "equations": LaTeXStructureParser._extract_equations(latex_content),
-            "citations": LaTeXStructureParser._extract_citations(latex_content),
-            "environments": LaTeXStructureParser._extract_environments(latex_content)
-        }
-        return structure
+# LLM outputs (paragraph edits, generated sections) are memoized on disk so
+# re-running the same input does not go back to the LLM
+LLM_CACHE_PATH = 'llm_edit_cache.sqlite'
 
-    @staticmethod
-    def _remove_ignore_blocks(latex_content: str) -> str:
-        r"""Remove any \ignore{...} blocks (nested braces handled).
 
-        Removes content wrapped in \ignore{...} which is commonly used to
-        hide content in LaTeX documents.
-        """
-        # Remove brace form \ignore{...} with nesting support
-        while '\\ignore{' in latex_content:
-            latex_content = re.sub(r'\\ignore\{([^{}]|\{[^{}]*\})*\}', '', latex_content, flags=re.DOTALL)
-        return latex_content
+def _lm_settings() -> Dict[str, Any]:
+    """Model and temperature of the configured LM, part of every LLM cache key
+    so a cached output is only reused for the model settings that produced it."""
+    lm = dspy.settings.lm
+    return {
+        "model": getattr(lm, "model", None),
+        "temperature": getattr(lm, "kwargs", {}).get("temperature"),
+    }
+
+
+class EditCache:
+    """SQLite-backed memo of LLM outputs, keyed by a digest of the call's inputs."""
+    def __init__(self, path: str = LLM_CACHE_PATH):
+        self.path = path
+        self._conn = None  # opened on first use, so unused caches create no file
+        self._lock = threading.Lock()
 
     @staticmethod
-    def parse_paragraphs(latex_content: str) -> List[Dict[str, Any]]:
-        r"""Parse LaTeX content into paragraphs with section/subsection hierarchy.
-
-        Returns a list of dicts with structure:
-        {
-            "index": int,
-            "section": str (section title or empty),
-            "subsection": str (subsection title or empty),
-            "paragraph": str (cleaned paragraph text),
-            "is_in_environment": bool (True if inside itemize, enumerate, etc.)
-        }
+    def key(paragraph_text: str, instruction: str) -> str:
+        lm_settings = json.dumps(_lm_settings(), sort_keys=True)
+        return hashlib.sha1(f"{paragraph_text}\x00{instruction}\x00{lm_settings}".encode('utf-8')).hexdigest()
 
-        - Removes \ignore{...} blocks before parsing
-        - Preserves section/subsection hierarchy
-        - Splits paragraphs on blank lines (2+ newlines)
-        - Filters out LaTeX commands and environments
-        """
-        content = LaTeXStructureParser._remove_ignore_blocks(latex_content)
-
-        # Remove LaTeX preamble (everything before \begin{document})
-        match = re.search(r'\\begin\{document\}', content)
-        if match:
-            content = content[match.end():]
-
-        # Remove \end{document} and anything after
-        content = re.sub(r'\\end\{document\}.*', '', content, flags=re.DOTALL)
-
-        # Normalize line endings
-        content = content.replace('\r\n', '\n')
-
-        # Extract section and subsection positions with their titles
-        sections_map = []
-        for m in re.finditer(r'\\section\*?\{([^}]+)\}', content):
-            sections_map.append((m.start(), m.group(1), 'section'))
-        for m in re.finditer(r'\\subsection\*?\{([^}]+)\}', content):
-            sections_map.append((m.start(), m.group(1), 'subsection'))
-        sections_map.sort(key=lambda x: x[0])
-
-        # Split into raw paragraphs on blank lines (2+ newlines)
-        raw_paras = re.split(r'\n\n+', content)
-
-        paragraphs = []
-        current_section = ""
-        current_subsection = ""
-        section_pos = 0
-
-        for idx, raw_para in enumerate(raw_paras):
-            para = raw_para.strip()
-            if not para:
-                continue
-
-            # Skip pure LaTeX structure lines (section/subsection definitions)
-            if para.startswith('\\section') or para.startswith('\\subsection'):
-                continue
-
-            # Skip \maketitle and other document markup
-            if para in ('\\maketitle', '\\tableofcontents', '\\begin{document}', '\\end{document}'):
-                continue
-
-            # Update current section/subsection based on position
-            para_pos = content.find(para, section_pos)
-            if para_pos == -1:
-                para_pos = section_pos
-            section_pos = para_pos + len(para)
-
-            for s_pos, title, s_type in sections_map:
-                if s_pos <= para_pos:
-                    if s_type == 'section':
-                        current_section = title
-                        current_subsection = ""
-                    elif s_type == 'subsection':
-                        current_subsection = title
-                else:
-                    break
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # shared by the batch editor's worker threads; access is serialized by _lock
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS edits (key TEXT PRIMARY KEY, value TEXT)")
+        return self._conn
 
-            # Clean up the paragraph: remove LaTeX-specific markup
-            cleaned = LaTeXStructureParser._clean_paragraph_text(para)
-            
-            if not cleaned:
-                continue
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM edits WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
 
-            # Detect if inside an environment (itemize, enumerate)
-            in_env = bool(re.search(r'\\item\b', para))
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO edits (key, value) VALUES (?, ?)", (key, value))
+            conn.commit()
 
-            paragraphs.append({
-                "index": len(paragraphs),
-                "section": current_section,
-                "subsection": current_subsection,
-                "paragraph": cleaned,
-                "is_in_environment": in_env
-            })
 
-        return paragraphs
+def _json_format(pretty: bool) -> Dict[str, Any]:
+    """json.dump(s) keyword arguments: indented when pretty, compact otherwise."""
+    return {'indent': 2} if pretty else {'separators': (',', ':')}
 
-    @staticmethod
-    def _clean_paragraph_text(text: str) -> str:
-        r"""Remove LaTeX markup from paragraph text while preserving content.
-
-        Removes or simplifies:
-        - \cite{...}, \ref{...}, \label{...}
-        - \textbf{...}, \textit{...}, \emph{...}
-        - \item directives
-        - Math mode delimiters (but keeps the math)
-        - \begin{...} and \end{...} environment markers
-        """
-        # Remove \begin{...} and \end{...} but keep content inside
-        text = re.sub(r'\\(begin|end)\{[^}]*\}', '', text)
-        
-        # Remove citation, reference, label commands
-        text = re.sub(r'\\(cite|ref|label)\{[^}]*\}', '', text)
-        
-        # Remove text formatting commands (keep inner text)
-        text = re.sub(r'\\(textbf|textit|emph|texttt|text|sout|uline)\{([^}]*)\}', r'\2', text)
-        
-        # Remove \em, \it, \bf styling marks
-        text = re.sub(r'\\(em|it|bf)\b\s*', '', text)
-        
-        # Remove \item markers
-        text = re.sub(r'\\item\s+', '', text)
-        
-        # Simplify inline math ($ ... $)
-        text = re.sub(r'\$([^$]+)\$', r'[\1]', text)
-        
-        # Clean up multiple spaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
-    @staticmethod
-    def _extract_title(latex_content: str) -> str:
-        """Extract document title."""
-        match = re.search(r'\\title\{([^}]+)\}', latex_content)
-        return match.group(1) if match else ""
 
-    @staticmethod
-    def _extract_sections(latex_content: str) -> List[str]:
-        """Extract all section titles."""
-        return re.findall(r'\\section\{([^}]+)\}', latex_content)
+def save_json(data: Any, filename: str, pretty: bool = False) -> None:
+    """Write data to filename as JSON, using orjson when available."""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **_json_format(pretty))
 
-    @staticmethod
-    def _extract_subsections(latex_content: str) -> List[str]:
-        """Extract all subsection titles."""
-        return re.findall(r'\\subsection\{([^}]+)\}', latex_content)
 
-    @staticmethod
-    def _extract_equations(latex_content: str) -> List[str]:
-        """Extract all equations."""
-        equations = re.findall(r'\$\$(.+?)\$\$', latex_content, re.DOTALL)
-        equations += re.findall(r'\$(.+?)\$', latex_content)
-        return equations
+def load_json(filename: str) -> Any:
+    """Read JSON from filename, using orjson when available."""
+    if orjson is not None:
+        with open(filename, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
-    @staticmethod
-    def _extract_citations(latex_content: str) -> List[str]:
-        """Extract all citations."""
-        return re.findall(r'\\cite\{([^}]+)\}', latex_content)
 
-    @staticmethod
-    def _extract_environments(latex_content: str) -> List[str]:
-        """Extract LaTeX environments (theorem, proof, etc.)."""
-        return re.findall(r'\\begin\{([a-z*]+)\}', latex_content)
+# JSON paragraph files can be large: read them item by item when ijson is
+# installed, and edit/write them in windows of this many items
+JSON_EDIT_WINDOW = 64
+
+# Number of LLM paragraph edits in flight at once (--workers)
+DEFAULT_EDIT_WORKERS = 8
+
+
+# Process umask, read once: mkstemp creates files 0600, so _atomic_write
+# applies the mode a plain open() would have given the output
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def _atomic_write(filename: str) -> Iterator[Any]:
+    """Open a text file that replaces filename only if the block completes.
+
+    Output goes to a temporary file next to filename, so an error midway
+    leaves any existing file untouched instead of truncated.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+                                    prefix=os.path.basename(filename) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            yield f
+            os.fchmod(f.fileno(), 0o666 & ~_UMASK)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _iter_json_array(f) -> Iterator[Any]:
+    """Yield the items of the JSON array in binary file f, streaming when possible."""
+    if ijson is not None:
+        yield from ijson.items(f, 'item', use_float=True)
+    else:
+        yield from json.load(f)
+
+
+def _chunked(iterable, size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of up to size items from iterable."""
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
 
 
 # 2. Define Signatures
@@ -297,69 +312,250 @@ class EditParagraph(dspy.Signature):
 
 
 # 3. Create the Proposal Generator Pipeline as a DSPy Module
+# Paraphrased topics ("AI in Healthcare" / "Artificial Intelligence in Medicine")
+# reuse earlier sections when their embeddings are at least this similar
+SEMANTIC_CACHE_THRESHOLD = 0.92
+EMBEDDING_MODEL = "openai/text-embedding-3-small"
+
+
+class SemanticCachedPredict(dspy.Module):
+    """Answer calls whose `semantic_field` closely paraphrases an earlier call's.
+
+    Every other input must match exactly (they are hashed into a bucket), so
+    e.g. an "Introduction" is never reused for a "Conclusion". Within a bucket
+    the embedding of `semantic_field` is compared by cosine similarity with
+    the stored ones, and the best match at or above `threshold` is returned.
+    Entries live in a table of the same SQLite file as `EditCache`.
+    """
+    def __init__(self, predict: dspy.Module, embedder, path: str = LLM_CACHE_PATH,
+                 semantic_field: str = "topic", threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        super().__init__()
+        self.predict = predict
+        self.signature = predict.signature
+        self.embedder = embedder
+        self.path = path
+        self.semantic_field = semantic_field
+        self.threshold = threshold
+        self._conn = None  # opened on first use
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS semantic (bucket TEXT, embedding BLOB, value TEXT)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS semantic_bucket ON semantic (bucket)")
+        return self._conn
+
+    def _bucket(self, kwargs: Dict[str, Any]) -> str:
+        payload = {
+            "signature": self.signature.signature,
+            "inputs": {k: v for k, v in kwargs.items() if k != self.semantic_field},
+            "model": getattr(dspy.settings.lm, "model", None),
+            "embedder": str(getattr(self.embedder, "model", self.embedder)),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _embed(self, text: str) -> np.ndarray:
+        vec = np.asarray(self.embedder(text), dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _lookup(self, bucket: str, embedding: np.ndarray) -> Optional[str]:
+        with self._lock:
+            rows = self._connect().execute("SELECT embedding, value FROM semantic WHERE bucket = ?", (bucket,)).fetchall()
+        if not rows:
+            return None
+        # brute force is fine at the size of a per-user cache bucket
+        matrix = np.frombuffer(b"".join(r[0] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+        scores = matrix @ embedding
+        best = int(scores.argmax())
+        return rows[best][1] if scores[best] >= self.threshold else None
+
+    def _store(self, bucket: str, embedding: np.ndarray, value: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT INTO semantic (bucket, embedding, value) VALUES (?, ?, ?)",
+                         (bucket, embedding.tobytes(), value))
+            conn.commit()
+
+    def forward(self, **kwargs):
+        bucket = self._bucket(kwargs)
+        embedding = self._embed(kwargs[self.semantic_field])
+        cached = self._lookup(bucket, embedding)
+        if cached is not None:
+            return dspy.Prediction(**json.loads(cached))
+        prediction = self.predict(**kwargs)
+        self._store(bucket, embedding, json.dumps(dict(prediction)))
+        return prediction
+
+    async def aforward(self, **kwargs):
+        # the embedding request and SQLite access block, so they run in a
+        # worker thread instead of stalling the other sections on the event loop
+        bucket = self._bucket(kwargs)
+        embedding = await asyncio.to_thread(self._embed, kwargs[self.semantic_field])
+        cached = await asyncio.to_thread(self._lookup, bucket, embedding)
+        if cached is not None:
+            return dspy.Prediction(**json.loads(cached))
+        prediction = await self.predict.acall(**kwargs)
+        await asyncio.to_thread(self._store, bucket, embedding, json.dumps(dict(prediction)))
+        return prediction
+
+
+class CachedPredict(dspy.Module):
+    """Wrap a predictor so identical calls are answered from an `EditCache`.
+
+    The key covers the signature, the input fields and the configured model
+    and temperature, so changing any of them goes back to the LLM.
+    """
+    def __init__(self, predict: dspy.Predict, cache: EditCache):
+        super().__init__()
+        self.predict = predict
+        self.cache = cache
+
+    def _key(self, kwargs: Dict[str, Any]) -> str:
+        payload = {
+            "signature": self.predict.signature.signature,
+            "inputs": kwargs,
+            **_lm_settings(),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def forward(self, **kwargs):
+        key = self._key(kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dspy.Prediction(**json.loads(cached))
+        prediction = self.predict(**kwargs)
+        self.cache.put(key, json.dumps(dict(prediction)))
+        return prediction
+
+    async def aforward(self, **kwargs):
+        key = self._key(kwargs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return dspy.Prediction(**json.loads(cached))
+        prediction = await self.predict.acall(**kwargs)
+        await asyncio.to_thread(self.cache.put, key, json.dumps(dict(prediction)))
+        return prediction
+
+
 class ProposalGenerator(dspy.Module):
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, cache_path: str = LLM_CACHE_PATH, history_log: Optional[str] = None,
+                 semantic_cache: bool = False, embedder=None):
         super().__init__()
+        self.edit_cache = EditCache(cache_path) if use_cache else None
+        cached = (lambda p: CachedPredict(p, self.edit_cache)) if use_cache else (lambda p: p)
+
         # Define the modules to be used in the pipeline
-        self.generate_outline = dspy.Predict(GenerateOutline)
-        self.generate_intro = dspy.Predict(GenerateSection)
-        self.generate_section_1 = dspy.Predict(GenerateSection)
-        self.generate_section_2 = dspy.Predict(GenerateSection)
-        self.generate_conclusion = dspy.Predict(GenerateSection)
-        self.proofread = dspy.Predict(Proofread)
+        self.generate_outline = cached(dspy.Predict(GenerateOutline))
+        # One predictor serves every section; they share the GenerateSection signature
+        section_predict = dspy.Predict(GenerateSection)
+        if semantic_cache:
+            # exact matches are still answered first by the outer CachedPredict
+            section_predict = SemanticCachedPredict(
+                section_predict, embedder or dspy.Embedder(EMBEDDING_MODEL), path=cache_path
+            )
+        self.generate_section = cached(section_predict)
+        self.proofread = cached(dspy.Predict(Proofread))
+        # edits are cached by _llm_edit, keyed on the paragraph and instruction
         self.edit_paragraph_predict = dspy.Predict(EditParagraph)
-        self.paragraph_history = ParagraphHistory()
+        self.paragraph_history = ParagraphHistory(history_log)
+
+    # (section title, outline details) for each generated section, in proposal order
+    SECTIONS = (
+        ("Introduction", "Write a captivating introduction that sets the stage and summarizes the proposal's value."),
+        ("Main Point One", "Detail the first main point, based on the generated outline."),
+        ("Main Point Two", "Detail the second main point, based on the generated outline."),
+        ("Conclusion", "Summarize the key takeaways and provide a call to action."),
+    )
 
     def forward(self, topic):
         # Step 1: Generate the outline
         outline_response = self.generate_outline(topic=topic)
         outline_str = outline_response.outline
 
-        # Step 2: Generate each section and track versions
-        intro_content = self.generate_intro(
-            topic=topic,
-            outline_details="Write a captivating introduction that sets the stage and summarizes the proposal's value.",
-            section_title="Introduction"
-        ).section_content
-        self.paragraph_history.add_version("Introduction", intro_content)
-
-        section_1_content = self.generate_section_1(
-            topic=topic,
-            outline_details="Detail the first main point, based on the generated outline.",
-            section_title="Main Point One"
-        ).section_content
-        self.paragraph_history.add_version("Main Point One", section_1_content)
-
-        section_2_content = self.generate_section_2(
-            topic=topic,
-            outline_details="Detail the second main point, based on the generated outline.",
-            section_title="Main Point Two"
-        ).section_content
-        self.paragraph_history.add_version("Main Point Two", section_2_content)
-
-        conclusion_content = self.generate_conclusion(
-            topic=topic,
-            outline_details="Summarize the key takeaways and provide a call to action.",
-            section_title="Conclusion"
-        ).section_content
-        self.paragraph_history.add_version("Conclusion", conclusion_content)
-
-        # Step 3: Combine sections
-        title_line = outline_str.splitlines()[0] if outline_str else "Untitled Proposal"
-        full_proposal = (
-            f"Title: {title_line}\n\n"
-            f"{intro_content}\n\n"
-            f"{section_1_content}\n\n"
-            f"{section_2_content}\n\n"
-            f"{conclusion_content}"
+        # Step 2: Generate the sections; they only depend on the topic, so
+        # they go to the shared predictor as one batch
+        examples = [
+            dspy.Example(topic=topic, outline_details=details, section_title=title)
+            .with_inputs("topic", "outline_details", "section_title")
+            for title, details in self.SECTIONS
+        ]
+        responses, _, errors = self.generate_section.batch(
+            examples, num_threads=len(examples), return_failed_examples=True, disable_progress_bar=True
         )
+        if errors:
+            raise errors[0]
+        contents = [r.section_content for r in responses]
 
-        # Step 4: Proofread
+        # Steps 3-4: Combine and proofread
+        full_proposal = self._combine_sections(outline_str, contents)
         polished_proposal = self.proofread(blog_post=full_proposal).proofread_blog_post
         self.paragraph_history.add_version("Final Proposal", polished_proposal)
 
         return polished_proposal
 
+    async def aforward(self, topic):
+        """Async counterpart of `forward` (used by `acall`); sections are gathered concurrently."""
+        outline_response = await self.generate_outline.acall(topic=topic)
+        outline_str = outline_response.outline
+
+        responses = await asyncio.gather(*(
+            self.generate_section.acall(topic=topic, outline_details=details, section_title=title)
+            for title, details in self.SECTIONS
+        ))
+        contents = [r.section_content for r in responses]
+
+        full_proposal = self._combine_sections(outline_str, contents)
+        polished_proposal = (await self.proofread.acall(blog_post=full_proposal)).proofread_blog_post
+        self.paragraph_history.add_version("Final Proposal", polished_proposal)
+
+        return polished_proposal
+
+    async def abatch(self, topics: List[str], max_concurrency: int = DEFAULT_EDIT_WORKERS) -> List[str]:
+        """Generate proposals for many topics concurrently; results are in topic order."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(topic):
+            async with semaphore:
+                return await self.acall(topic=topic)
+
+        return list(await asyncio.gather(*(run(t) for t in topics)))
+
+    def stream(self, topic):
+        """Generate a proposal, yielding each section as soon as it is written.
+
+        Yields (title, content) pairs for the sections in completion order,
+        then ("Final Proposal", polished_text) once the combined proposal has
+        been proofread, so callers can show progress instead of waiting for
+        every LLM call to finish.
+        """
+        outline_str = self.generate_outline(topic=topic).outline
+
+        contents = [None] * len(self.SECTIONS)
+        with ThreadPoolExecutor(max_workers=len(self.SECTIONS)) as executor:
+            futures = {
+                executor.submit(self.generate_section, topic=topic, outline_details=details, section_title=title): index
+                for index, (title, details) in enumerate(self.SECTIONS)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                contents[index] = future.result().section_content
+                yield self.SECTIONS[index][0], contents[index]
+
+        full_proposal = self._combine_sections(outline_str, contents)
+        polished_proposal = self.proofread(blog_post=full_proposal).proofread_blog_post
+        self.paragraph_history.add_version("Final Proposal", polished_proposal)
+        yield "Final Proposal", polished_proposal
+
+    def _combine_sections(self, outline_str: str, contents: List[str]) -> str:
+        """Record a version of each generated section and join them under the title line."""
+        for (title, _), content in zip(self.SECTIONS, contents):
+            self.paragraph_history.add_version(title, content)
+
+        title_line = outline_str.partition('\n')[0] or "Untitled Proposal"
+        return f"Title: {title_line}\n\n" + "\n\n".join(contents)
+
     def edit_paragraph_via_llm(self, paragraph_text: str, instruction: str, section_title: str = "", user_hint: str = "") -> str:
         """Use the LLM to edit a single paragraph and record a new version.
 
@@ -371,26 +567,76 @@ class ProposalGenerator(dspy.Module):
 
         Returns the edited paragraph text.
         """
+        edited = self._llm_edit(paragraph_text, instruction, user_hint)
+        self._record_edit(paragraph_text, edited, section_title)
+        return edited
+
+    def edit_paragraphs_batch(self, items: List[Dict[str, str]], max_workers: int = DEFAULT_EDIT_WORKERS) -> List[Any]:
+        """Edit many paragraphs concurrently and record each result as a new version.
+
+        Each item holds the arguments of `edit_paragraph_via_llm`: `paragraph`,
+        `instruction`, and optionally `section_title` and `user_hint`. Returns
+        the edited texts in input order; an item whose LLM call failed gets the
+        exception instead of a string. With `max_workers` <= 1 the items are
+        edited one after another on the calling thread.
+        """
+        if not items:
+            return []
+
+        def run(item):
+            try:
+                return self._llm_edit(item['paragraph'], item['instruction'], item.get('user_hint', ''))
+            except Exception as e:
+                return e
+
+        if max_workers <= 1 or len(items) == 1:
+            results = [run(item) for item in items]
+        else:
+            # LLM calls are network-bound, so threads overlap them well
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+                results = list(executor.map(run, items))
+
+        # Record versions in input order, on this thread
+        for item, result in zip(items, results):
+            if not isinstance(result, Exception):
+                self._record_edit(item['paragraph'], result, item.get('section_title', ''))
+        return results
+
+    def _llm_edit(self, paragraph_text: str, instruction: str, user_hint: str = "") -> str:
+        """Ask the LLM to edit one paragraph, without recording history."""
         # Combine instruction with user hint if provided
         full_instruction = instruction
         if user_hint:
             full_instruction = f"{instruction}\n\nUser hints/context: {user_hint}"
-        
-        resp = self.edit_paragraph_predict(paragraph=paragraph_text, instruction=full_instruction)
-        edited = resp.edited_paragraph
-        # record version
-        key = section_title or f"Paragraph_{hash(paragraph_text) % 10000}"
-        self.paragraph_history.add_version(key, edited)
+
+        if self.edit_cache is None:
+            return self.edit_paragraph_predict(paragraph=paragraph_text, instruction=full_instruction).edited_paragraph
+
+        key = EditCache.key(paragraph_text, full_instruction)
+        edited = self.edit_cache.get(key)
+        if edited is None:
+            edited = self.edit_paragraph_predict(paragraph=paragraph_text, instruction=full_instruction).edited_paragraph
+            self.edit_cache.put(key, edited)
         return edited
 
+    def _record_edit(self, paragraph_text: str, edited: str, section_title: str = "") -> None:
+        """Record an edited paragraph as a new version in the history."""
+        # str hash() is salted per process and % 10000 collides quickly; a digest is stable across runs
+        key = section_title or f"Paragraph_{hashlib.blake2b(paragraph_text.encode('utf-8'), digest_size=8).hexdigest()}"
+        self.paragraph_history.add_version(key, edited)
+
     def _compute_unified_diff(self, original: str, edited: str) -> str:
         """Return a unified diff between original and edited paragraph texts."""
+        if original == edited:
+            # unchanged paragraphs are the common case; difflib would yield nothing anyway
+            return ''
         orig_lines = original.splitlines(keepends=True)
         edited_lines = edited.splitlines(keepends=True)
         diff = difflib.unified_diff(orig_lines, edited_lines, fromfile='original', tofile='edited', lineterm='')
         return '\n'.join(diff)
 
-    def process_json_instructions(self, json_path: str, apply_changes: bool = True, extract_changes: bool = False, global_hint: str = None) -> Dict[str, Any]:
+    def process_json_instructions(self, json_path: str, apply_changes: bool = True, extract_changes: bool = False, global_hint: str = None,
+                                  pretty: bool = False, max_workers: int = DEFAULT_EDIT_WORKERS) -> Dict[str, Any]:
         """Process a JSON file containing paragraph objects and apply instructions.
 
         The expected JSON is an array of paragraph dicts similar to the output
@@ -400,56 +646,87 @@ class ProposalGenerator(dspy.Module):
 
         If `extract_changes` is True, returns a dict mapping paragraph indices
         to unified diffs between the original and final text.
+
+        Up to `max_workers` LLM edits run concurrently. Output files are
+        compact JSON unless `pretty` is True.
         """
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        base, ext = os.path.splitext(json_path)
+        out_path = base + '_processed' + ext
+        diff_path = base + '_diffs.json'
+        fmt = _json_format(pretty)
+        key_sep = ': ' if pretty else ':'
+
+        # Items are read, edited and written a window at a time, so memory
+        # stays bounded by the window rather than the size of the file
+        # Binary input: ijson parses bytes natively (str input is decoded
+        # through a slow compatibility path). Outputs replace their files
+        # only once complete, so a failure never leaves truncated JSON.
+        with open(json_path, 'rb') as f, \
+                _atomic_write(out_path) as out, \
+                (_atomic_write(diff_path) if extract_changes else nullcontext()) as diff_out:
+            out.write('[')
+            if extract_changes:
+                diff_out.write('{')
+            first = True
+            for window in _chunked(_iter_json_array(f), JSON_EDIT_WINDOW):
+                self._apply_json_edits(window, apply_changes, global_hint, max_workers)
+                for item in window:
+                    sep = '\n' if first else ',\n'
+                    out.write(sep + json.dumps(item, **fmt))
+                    if extract_changes:
+                        orig = item.get('paragraph') or item.get('original') or ''
+                        d = self._compute_unified_diff(orig, item['final'])
+                        diff_out.write(f"{sep}{json.dumps(str(item.get('index')))}{key_sep}{json.dumps(d)}")
+                    first = False
+            out.write('\n]')
+            if extract_changes:
+                diff_out.write('\n}')
 
-        results = []
-        diffs = {}
+        if extract_changes:
+            return {'processed_json': out_path, 'diffs_json': diff_path}
+        return {'processed_json': out_path}
 
-        for item in data:
-            idx = item.get('index')
+    def _apply_json_edits(self, items: List[Dict[str, Any]], apply_changes: bool, global_hint: str = None,
+                          max_workers: int = DEFAULT_EDIT_WORKERS) -> None:
+        """Set `final` (and `error` on failure) on each JSON paragraph item, editing concurrently."""
+        # Gather every edit up front so the LLM calls can run concurrently
+        jobs = []
+        for pos, item in enumerate(items):
             orig = item.get('paragraph') or item.get('original') or ''
             # instruction precedence: item.instruction -> item.hint -> global_hint
             instr = item.get('instruction') or item.get('hint') or global_hint
-
+            if apply_changes and instr:
+                jobs.append((pos, {
+                    'paragraph': orig,
+                    'instruction': instr,
+                    'section_title': item.get('section', ''),
+                    'user_hint': item.get('hint', '') or global_hint or '',
+                }))
+        edits = dict(zip(
+            (pos for pos, _ in jobs),
+            self.edit_paragraphs_batch([job for _, job in jobs], max_workers),
+        ))
+
+        for pos, item in enumerate(items):
+            orig = item.get('paragraph') or item.get('original') or ''
             final_text = item.get('final', orig)
 
-            if apply_changes and instr:
-                # apply LLM edit
-                try:
-                    edited = self.edit_paragraph_via_llm(orig, instr, section_title=item.get('section', ''), user_hint=item.get('hint', '') or global_hint or '')
-                    final_text = edited
-                except Exception as e:
+            if pos in edits:
+                if isinstance(edits[pos], Exception):
                     # on error, keep original and record error in item
-                    item['error'] = str(e)
+                    item['error'] = str(edits[pos])
+                else:
+                    final_text = edits[pos]
 
             # record final
             item['final'] = final_text
-            results.append(item)
-
-            if extract_changes:
-                d = self._compute_unified_diff(orig, final_text)
-                diffs[str(idx)] = d
 
-        # Save back results next to original JSON
-        base, ext = os.path.splitext(json_path)
-        out_path = base + '_processed' + ext
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
-
-        # also save diffs if requested
-        if extract_changes:
-            diff_path = base + '_diffs.json'
-            with open(diff_path, 'w', encoding='utf-8') as f:
-                json.dump(diffs, f, indent=2)
-            return {'processed_json': out_path, 'diffs_json': diff_path}
-
-        return {'processed_json': out_path}
-
-    def extract_changes(self, original_paragraphs: List[Dict[str, Any]], edited_paragraphs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def extract_changes(self, original_texts: tuple, edited_paragraphs: List[Paragraph]) -> Dict[str, Any]:
         """Extract and summarize changes between original and edited paragraphs.
 
+        `original_texts` holds the original paragraph text for each entry of
+        `edited_paragraphs`, in the same order.
+
         Returns a dict with:
         - total_paragraphs: number of paragraphs
         - changed_paragraphs: number that were edited
@@ -458,27 +735,29 @@ class ProposalGenerator(dspy.Module):
         changes = []
         changed_count = 0
         
-        for orig, edited in zip(original_paragraphs, edited_paragraphs):
-            if orig['paragraph'] != edited.get('final', orig['paragraph']):
+        for orig_text, edited in zip(original_texts, edited_paragraphs):
+            edited_text = orig_text if edited.final is None else edited.final
+            if orig_text != edited_text:
                 changed_count += 1
                 changes.append({
-                    "index": orig['index'],
-                    "section": orig['section'],
-                    "subsection": orig['subsection'],
-                    "original": orig['paragraph'],
-                    "edited": edited.get('final', orig['paragraph']),
-                    "change_type": "llm_edit" if edited.get('final') else "manual_edit"
+                    "index": edited.index,
+                    "section": edited.section,
+                    "subsection": edited.subsection,
+                    "original": orig_text,
+                    "edited": edited_text,
+                    "change_type": "llm_edit" if edited.final else "manual_edit"
                 })
         
         return {
-            "total_paragraphs": len(original_paragraphs),
+            "total_paragraphs": len(original_texts),
             "changed_paragraphs": changed_count,
-            "change_percentage": (changed_count / len(original_paragraphs) * 100) if original_paragraphs else 0,
+            "change_percentage": (changed_count / len(original_texts) * 100) if original_texts else 0,
             "changes": changes
         }
 
     def import_and_edit_latex(self, filepath: str, auto_instruction: str = None, interactive: bool = True, 
-                              auto_hints: str = None, extract_changes_summary: bool = False) -> tuple:
+                              auto_hints: str = None, extract_changes_summary: bool = False,
+                              max_workers: int = DEFAULT_EDIT_WORKERS) -> tuple:
         """Import a .tex file, parse paragraphs, and allow editing each paragraph.
 
         Args:
@@ -487,6 +766,7 @@ class ProposalGenerator(dspy.Module):
             interactive: If True, prompt user for each paragraph
             auto_hints: Optional hints/context to provide to the LLM (same for all paragraphs)
             extract_changes_summary: If True, return a summary of all changes made
+            max_workers: Number of concurrent LLM edits in non-interactive mode
 
         Interactive mode options per paragraph:
           (e)dit via LLM, (h)int - provide context hint, (r)eplace manually, (s)kip, (q)uit
@@ -495,22 +775,34 @@ class ProposalGenerator(dspy.Module):
             tuple of (results, changes_summary) if extract_changes_summary=True
             else just results list
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            latex = f.read()
+        latex = LaTeXStructureParser.read_document(filepath)
 
         paragraphs = LaTeXStructureParser.parse_paragraphs(latex)
         results = []
-        original_paragraphs = [p.copy() for p in paragraphs]  # Keep original for comparison
+        original_texts = tuple(p.paragraph for p in paragraphs)  # Keep original text for comparison
+
+        # non-interactive: run all auto edits concurrently before walking the paragraphs
+        auto_edits = None
+        if not interactive and auto_instruction:
+            auto_edits = self.edit_paragraphs_batch([
+                {
+                    'paragraph': p.paragraph,
+                    'instruction': auto_instruction,
+                    'section_title': p.section or '',
+                    'user_hint': auto_hints or "",
+                }
+                for p in paragraphs
+            ], max_workers)
 
         for p in paragraphs:
-            para_text = p['paragraph']
+            para_text = p.paragraph
             current_hint = ""  # Track hint for this paragraph
             
             print('\n' + '=' * 60)
-            header = p['section'] or '(no section)'
-            if p['subsection']:
-                header += f' > {p["subsection"]}'
-            print(f"Paragraph {p['index']} — Section: {header}\n")
+            header = p.section or '(no section)'
+            if p.subsection:
+                header += f' > {p.subsection}'
+            print(f"Paragraph {p.index} — Section: {header}\n")
             print(para_text)
 
             final_text = para_text
@@ -524,7 +816,7 @@ class ProposalGenerator(dspy.Module):
                             instr = 'Improve clarity and grammar while preserving meaning.'
                         final_text = self.edit_paragraph_via_llm(
                             para_text, instr, 
-                            section_title=p['section'] or '', 
+                            section_title=p.section or '', 
                             user_hint=current_hint
                         )
                         print('\nEdited paragraph:\n')
@@ -546,32 +838,32 @@ class ProposalGenerator(dspy.Module):
                                 break
                             lines.append(line)
                         final_text = '\n'.join(lines)
-                        self.paragraph_history.add_version(p['section'] or f'Paragraph_{p["index"]}', final_text)
+                        self.paragraph_history.add_version(p.section or f'Paragraph_{p.index}', final_text)
                         break
                     elif choice == 's':
                         break
                     elif choice == 'q':
                         print('Quitting interactive editor.')
-                        results.append({**p, 'final': final_text})
+                        p.final = final_text
+                        results.append(p)
                         if extract_changes_summary:
-                            changes = self.extract_changes(original_paragraphs, results)
+                            changes = self.extract_changes(original_texts, results)
                             return results, changes
                         return results
                     else:
                         print('Unknown choice, please enter e, h, r, s, or q.')
             else:
                 # non-interactive: apply auto_instruction to all paragraphs
-                if auto_instruction:
-                    final_text = self.edit_paragraph_via_llm(
-                        para_text, auto_instruction, 
-                        section_title=p['section'] or '', 
-                        user_hint=auto_hints or ""
-                    )
+                if auto_edits is not None:
+                    final_text = auto_edits[p.index]
+                    if isinstance(final_text, Exception):
+                        raise final_text
 
-            results.append({**p, 'final': final_text})
+            p.final = final_text
+            results.append(p)
 
         if extract_changes_summary:
-            changes = self.extract_changes(original_paragraphs, results)
+            changes = self.extract_changes(original_texts, results)
             return results, changes
         return results
 
@@ -589,9 +881,18 @@ if __name__ == "__main__":
     ap.add_argument('--apply-json', help='Path to a JSON file with paragraph objects to apply instructions from')
     ap.add_argument('--json-hint', help='Global hint/context to apply to JSON-driven edits (overridden by per-item hint/instruction)')
     ap.add_argument('--json-extract-diffs', action='store_true', help='When applying JSON instructions, also extract unified diffs for each paragraph')
+    ap.add_argument('--pretty', action='store_true', help='Write indented JSON output files (default: compact)')
+    ap.add_argument('--workers', type=int, default=DEFAULT_EDIT_WORKERS, help='Number of paragraph edits to run concurrently (1 = serial)')
+    ap.add_argument('--topic', '-t', action='append', help='Generate a proposal for this topic (repeat for several; they run concurrently)')
+    ap.add_argument('--semantic-cache', action='store_true', help='Reuse generated sections for closely paraphrased topics (uses an embedding model)')
+    ap.add_argument('--no-cache', action='store_true', help=f'Always call the LLM instead of reusing edits cached in {LLM_CACHE_PATH}')
     args = ap.parse_args()
 
-    proposal_writer = ProposalGenerator()
+    proposal_writer = ProposalGenerator(
+        use_cache=not args.no_cache,
+        history_log="proposal_paragraph_history.jsonl",
+        semantic_cache=args.semantic_cache,
+    )
 
     # If user wants to process a JSON of paragraph instructions, handle that first
     if args.apply_json:
@@ -600,13 +901,17 @@ if __name__ == "__main__":
             args.apply_json,
             apply_changes=True,
             extract_changes=args.json_extract_diffs,
-            global_hint=args.json_hint
+            global_hint=args.json_hint,
+            pretty=args.pretty,
+            max_workers=args.workers
         )
         print("JSON processing completed. Outputs:")
         for k, v in res.items():
             print(f" - {k}: {v}")
-        # exit after processing JSON unless user also provided a LaTeX file
+        # exit after processing JSON unless user also provided a LaTeX file;
+        # saving first also empties the history log for the next run
         if not args.latex_file:
+            proposal_writer.paragraph_history.save_to_file("proposal_paragraph_history.json", pretty=args.pretty)
             sys.exit(0)
 
     if args.latex_file:
@@ -616,7 +921,8 @@ if __name__ == "__main__":
             auto_instruction=args.auto_instruction, 
             interactive=interactive,
             auto_hints=args.auto_hints,
-            extract_changes_summary=args.extract_changes
+            extract_changes_summary=args.extract_changes,
+            max_workers=args.workers
         )
         
         # Handle return value (might be tuple if extract_changes is True)
@@ -627,22 +933,35 @@ if __name__ == "__main__":
             changes_summary = None
         
         # Save paragraph history and results
-        proposal_writer.paragraph_history.save_to_file("proposal_paragraph_history.json")
-        out_json = args.latex_file.rstrip('.tex') + '_edited_paragraphs.json'
-        with open(out_json, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+        proposal_writer.paragraph_history.save_to_file("proposal_paragraph_history.json", pretty=args.pretty)
+        latex_base, _ = os.path.splitext(args.latex_file)
+        out_json = latex_base + '_edited_paragraphs.json'
+        save_json([r.to_dict() for r in results], out_json, args.pretty)
         print(f"\nParagraph editing completed. Results saved to '{out_json}' and history to 'proposal_paragraph_history.json'.")
         
         # Save changes summary if requested
         if changes_summary:
-            changes_file = args.latex_file.rstrip('.tex') + '_changes_summary.json'
-            with open(changes_file, 'w', encoding='utf-8') as f:
-                json.dump(changes_summary, f, indent=2)
+            changes_file = latex_base + '_changes_summary.json'
+            save_json(changes_summary, changes_file, args.pretty)
             print(f"Changes summary saved to '{changes_file}'.")
             print(f"\nSummary: {changes_summary['changed_paragraphs']}/{changes_summary['total_paragraphs']} paragraphs modified ({changes_summary['change_percentage']:.1f}%)")
         
         sys.exit(0)
 
     # Default behavior: generate a proposal from topic
+    if args.topic and len(args.topic) == 1:
+        # a single topic: show sections as they are written
+        for title, content in proposal_writer.stream(args.topic[0]):
+            print('\n' + '=' * 60)
+            print(f"{title}\n")
+            print(content)
+        proposal_writer.paragraph_history.save_to_file("proposal_paragraph_history.json", pretty=args.pretty)
+    elif args.topic:
+        proposals = asyncio.run(proposal_writer.abatch(args.topic, max_concurrency=args.workers))
+        for topic, proposal in zip(args.topic, proposals):
+            print('\n' + '=' * 60)
+            print(f"Proposal: {topic}\n")
+            print(proposal)
+        proposal_writer.paragraph_history.save_to_file("proposal_paragraph_history.json", pretty=args.pretty)
     sys.exit(0)
     
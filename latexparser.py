@@ -0,0 +1,405 @@
+import hashlib
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import List, Dict, Any, Iterator, Optional
+
+# Patterns are compiled once here rather than on every parser call
+_IGNORE_OPEN = '\\ignore{'
+# Inside an \ignore block only braces matter; an escaped character (\{, \},
+# \\ ...) is consumed as one literal token so it never changes the depth
+_BRACE_TOKEN_RE = re.compile(r'\\.|[{}]', re.DOTALL)
+_BEGIN_DOCUMENT = '\\begin{document}'
+_END_DOCUMENT = '\\end{document}'
+_HEADING_RE = re.compile(r'\\(section|subsection)\*?\{([^}]+)\}')
+_PARA_BREAK_RE = re.compile(r'\n\n+')
+_HAS_ITEM_RE = re.compile(r'\\item\b')
+
+# Paragraph cleanup: every markup form is one alternative of a single pattern
+# so the text is scanned once. Group 1 is formatted text to keep (one level
+# of nested braces allowed), group 2 is inline math.
+_CLEAN_RE = re.compile(
+    r'\\(?:begin|end)\{[^}]*\}'
+    r'|\\(?:cite|ref|label)\{[^}]*\}'
+    r'|\\(?:textbf|textit|emph|texttt|text|sout|uline)\{((?:[^{}]|\{[^{}]*\})*)\}'
+    r'|\\(?:em|it|bf)\b\s*'
+    r'|\\item\s+'
+    r'|\$([^$]+)\$'
+)
+_WS_RE = re.compile(r'\s+')
+
+
+def _clean_replacement(match: re.Match) -> str:
+    """Replacement for a _CLEAN_RE match; kept text is cleaned recursively."""
+    kept, math = match.group(1), match.group(2)
+    if kept is not None:
+        return _CLEAN_RE.sub(_clean_replacement, kept)
+    if math is not None:
+        # math that was only markup (e.g. $\it$) is dropped along with its delimiters
+        math = _CLEAN_RE.sub(_clean_replacement, math)
+        return f"[{math}]" if math.strip() else ''
+    return ''
+
+# Structure extraction
+_TITLE_RE = re.compile(r'\\title\{([^}]+)\}')
+_SECTION_RE = re.compile(r'\\section\{([^}]+)\}')
+_SUBSECTION_RE = re.compile(r'\\subsection\{([^}]+)\}')
+# Display math is group 1, inline math group 2; inline delimiters must be
+# lone '$' so the contents of $$...$$ are never picked up a second time.
+# _UNESCAPED rejects a '$' written as \$ (but not one after a \\ line break).
+_UNESCAPED = r'(?<!(?<!\\)\\)'
+_EQUATION_RE = re.compile(
+    _UNESCAPED + r'\$\$(.+?)\$\$'
+    r'|(?<!\$)' + _UNESCAPED + r'\$(?!\$)([^\n]+?)(?<!\$)' + _UNESCAPED + r'\$(?!\$)',
+    re.DOTALL,
+)
+_CITATION_RE = re.compile(r'\\cite\{([^}]+)\}')
+_ENVIRONMENT_RE = re.compile(r'\\begin\{([a-z*]+)\}')
+
+# All of the above in one alternation, so parse_structure needs a single scan;
+# the matched alternative is identified by its group name (match.lastgroup)
+_STRUCT_RE = re.compile(
+    r'\\title\{(?P<title>[^}]+)\}'
+    r'|\\section\{(?P<section>[^}]+)\}'
+    r'|\\subsection\{(?P<subsection>[^}]+)\}'
+    r'|\\cite\{(?P<cite>[^}]+)\}'
+    r'|\\begin\{(?P<env>[a-z*]+)\}'
+    r'|' + _UNESCAPED + r'\$\$(?P<display_math>.+?)\$\$'
+    r'|(?<!\$)' + _UNESCAPED + r'\$(?!\$)(?P<inline_math>[^\n]+?)(?<!\$)' + _UNESCAPED + r'\$(?!\$)',
+    re.DOTALL,
+)
+# Alternatives whose captured text may itself contain citations, math, etc.
+_STRUCT_CONTAINERS = frozenset(('title', 'section', 'subsection', 'display_math', 'inline_math'))
+
+
+def _memoize_by_digest(maxsize: int):
+    """Memoize a function of one document string, keyed by the text's digest.
+
+    Unlike functools.lru_cache, the cache holds a 16-byte digest and the
+    result, never the document itself, so memoized documents are not kept
+    alive for the life of the process.
+    """
+    def decorator(fn):
+        cache: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(fn)
+        def wrapper(text: str):
+            key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+            result = fn(text)
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
+
+@dataclass(slots=True)
+class Paragraph:
+    """A paragraph parsed from LaTeX with its place in the section hierarchy."""
+    index: int
+    section: str  # section title or empty
+    subsection: str  # subsection title or empty
+    paragraph: str  # cleaned paragraph text
+    is_in_environment: bool  # True if inside itemize, enumerate, etc.
+    final: Optional[str] = None  # edited text, once the paragraph has been through the editor
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "index": self.index,
+            "section": self.section,
+            "subsection": self.subsection,
+            "paragraph": self.paragraph,
+            "is_in_environment": self.is_in_environment,
+        }
+        if self.final is not None:
+            d["final"] = self.final
+        return d
+
+
+class LaTeXStructureParser:
+    """Parse LaTeX documents and extract structure."""
+    
+    @staticmethod
+    def read_document(filepath: str) -> str:
+        r"""Read a .tex file for `parse_paragraphs`, decoding only what it will use.
+
+        The file is memory-mapped and the preamble before \begin{document} and
+        everything after \end{document} are dropped as raw bytes, so large
+        documents are not decoded (or held as str) in full. The cut is only
+        made where no \ignore{ block precedes the marker, since parsing
+        removes those blocks before looking for the document markers.
+        """
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                ignore_at = mm.find(_IGNORE_OPEN.encode())
+                start = mm.find(_BEGIN_DOCUMENT.encode())
+                end = mm.find(_END_DOCUMENT.encode(), max(start, 0))
+                if 0 <= ignore_at < start:
+                    # the real \begin{document} depends on \ignore removal
+                    start = end = -1
+                if end < 0 or 0 <= ignore_at < end:
+                    end = len(mm)
+                data = mm[max(start, 0):end]
+        text = data.decode('utf-8')
+        # match text-mode reading (universal newlines)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+
+    @staticmethod
+    def parse_structure(latex_content: str) -> Dict[str, Any]:
+        """Extract structure from LaTeX content."""
+        structure = LaTeXStructureParser._parse_structure_cached(latex_content)
+        # copy the lists so callers can't modify the cached result
+        return {k: list(v) if isinstance(v, list) else v for k, v in structure.items()}
+
+    @staticmethod
+    @_memoize_by_digest(maxsize=8)
+    def _parse_structure_cached(latex_content: str) -> Dict[str, Any]:
+        """Memoized body of `parse_structure` (the same document is often parsed repeatedly)."""
+        found = {kind: [] for kind in _STRUCT_RE.groupindex}
+        LaTeXStructureParser._scan_structure(latex_content, found)
+        structure = {
+            "title": found["title"][0] if found["title"] else "",
+            "sections": found["section"],
+            "subsections": found["subsection"],
+            "equations": found["display_math"] + found["inline_math"],
+            "citations": found["cite"],
+            "environments": found["env"]
+        }
+        return structure
+
+    @staticmethod
+    def _scan_structure(text: str, found: Dict[str, List[str]]) -> None:
+        """Append every structural element in text to found[kind], in source order."""
+        for m in _STRUCT_RE.finditer(text):
+            kind = m.lastgroup
+            value = m.group(kind)
+            found[kind].append(value)
+            if kind in _STRUCT_CONTAINERS:
+                # e.g. a \cite inside a section title or \begin{aligned} inside $$...$$
+                LaTeXStructureParser._scan_structure(value, found)
+
+    @staticmethod
+    def _remove_ignore_blocks(latex_content: str) -> str:
+        r"""Remove any \ignore{...} blocks (nested braces handled).
+
+        Removes content wrapped in \ignore{...} which is commonly used to
+        hide content in LaTeX documents. A single left-to-right scan tracks
+        brace depth, so arbitrarily deep nesting is handled in linear time;
+        escaped braces (\{ and \}) are literals and do not count.
+        An unterminated block hides the rest of the document.
+        """
+        kept = []
+        pos = 0
+        n = len(latex_content)
+        while pos < n:
+            start = latex_content.find(_IGNORE_OPEN, pos)
+            if start < 0:
+                kept.append(latex_content[pos:])
+                break
+            kept.append(latex_content[pos:start])
+            depth = 1
+            pos = n
+            # the regex engine skips over plain text between brace tokens
+            for m in _BRACE_TOKEN_RE.finditer(latex_content, start + len(_IGNORE_OPEN)):
+                token = m.group()
+                if token == '{':
+                    depth += 1
+                elif token == '}':
+                    depth -= 1
+                    if not depth:
+                        pos = m.end()
+                        break
+        return ''.join(kept)
+
+    @staticmethod
+    def parse_paragraphs(latex_content: str) -> List[Paragraph]:
+        r"""Parse LaTeX content into paragraphs with section/subsection hierarchy.
+
+        Returns a list of `Paragraph` records (use `to_dict()` for JSON).
+
+        - Removes \ignore{...} blocks before parsing
+        - Preserves section/subsection hierarchy
+        - Splits paragraphs on blank lines (2+ newlines)
+        - Filters out LaTeX commands and environments
+        """
+        # Records are mutable (editing sets `final`), so each call gets fresh
+        # ones built from the memoized field tuples
+        return [Paragraph(*fields) for fields in LaTeXStructureParser._parse_paragraph_fields(latex_content)]
+
+    @staticmethod
+    @_memoize_by_digest(maxsize=8)
+    def _parse_paragraph_fields(latex_content: str) -> tuple:
+        """Memoized body of `parse_paragraphs`, returning one field tuple per paragraph."""
+        content = LaTeXStructureParser._remove_ignore_blocks(latex_content)
+
+        # Remove LaTeX preamble (everything before \begin{document})
+        start = content.find(_BEGIN_DOCUMENT)
+        if start >= 0:
+            content = content[start + len(_BEGIN_DOCUMENT):]
+
+        # Remove \end{document} and anything after
+        end = content.find(_END_DOCUMENT)
+        if end >= 0:
+            content = content[:end]
+
+        # Normalize line endings
+        content = content.replace('\r\n', '\n')
+
+        # Extract section and subsection positions with their titles
+        # (one pattern for both, so matches come back already in source order)
+        sections_map = [(m.start(), m.group(2), m.group(1)) for m in _HEADING_RE.finditer(content)]
+
+        paragraphs = []
+        append = paragraphs.append
+        current_section = ""
+        current_subsection = ""
+        section_idx = 0
+        para_index = 0
+
+        # Walk raw paragraphs (split on blank lines, 2+ newlines) by span, so
+        # each one's offset is known and only the current slice is alive
+        for raw_start, raw_end in LaTeXStructureParser._paragraph_spans(content):
+            raw_para = content[raw_start:raw_end]
+            para = raw_para.strip()
+            if not para:
+                continue
+
+            # Skip pure LaTeX structure lines (section/subsection definitions)
+            if para.startswith('\\section') or para.startswith('\\subsection'):
+                continue
+
+            # Skip \maketitle and other document markup
+            if para in ('\\maketitle', '\\tableofcontents', '\\begin{document}', '\\end{document}'):
+                continue
+
+            # Update current section/subsection based on position; both the
+            # paragraphs and sections_map are in source order, so the cursor
+            # only ever moves forward
+            para_pos = raw_start + len(raw_para) - len(raw_para.lstrip())
+            while section_idx < len(sections_map) and sections_map[section_idx][0] <= para_pos:
+                _, title, s_type = sections_map[section_idx]
+                if s_type == 'section':
+                    current_section = title
+                    current_subsection = ""
+                elif s_type == 'subsection':
+                    current_subsection = title
+                section_idx += 1
+
+            # Clean up the paragraph: remove LaTeX-specific markup
+            cleaned = LaTeXStructureParser._clean_paragraph_text(para)
+            
+            if not cleaned:
+                continue
+
+            # Detect if inside an environment (itemize, enumerate)
+            in_env = bool(_HAS_ITEM_RE.search(para))
+
+            append((para_index, current_section, current_subsection, cleaned, in_env))
+            para_index += 1
+
+        return tuple(paragraphs)
+
+    @staticmethod
+    def _paragraph_spans(content: str) -> Iterator[tuple]:
+        """Yield (start, end) offsets of the blank-line separated chunks of content."""
+        prev = 0
+        for m in _PARA_BREAK_RE.finditer(content):
+            yield prev, m.start()
+            prev = m.end()
+        yield prev, len(content)
+
+    @staticmethod
+    def _clean_paragraph_text(text: str) -> str:
+        r"""Remove LaTeX markup from paragraph text while preserving content.
+
+        Removes or simplifies:
+        - \cite{...}, \ref{...}, \label{...}
+        - \textbf{...}, \textit{...}, \emph{...}
+        - \item directives
+        - Math mode delimiters (but keeps the math)
+        - \begin{...} and \end{...} environment markers
+        """
+        # Every markup pattern starts with a backslash or '$'; plain prose only
+        # needs its whitespace collapsed
+        if '\\' in text or '$' in text:
+            text = _CLEAN_RE.sub(_clean_replacement, text)
+        return _WS_RE.sub(' ', text).strip()
+    @staticmethod
+    def _extract_title(latex_content: str) -> str:
+        """Extract document title."""
+        match = _TITLE_RE.search(latex_content)
+        return match.group(1) if match else ""
+
+    @staticmethod
+    def _extract_sections(latex_content: str) -> List[str]:
+        """Extract all section titles."""
+        return _SECTION_RE.findall(latex_content)
+
+    @staticmethod
+    def _extract_subsections(latex_content: str) -> List[str]:
+        """Extract all subsection titles."""
+        return _SUBSECTION_RE.findall(latex_content)
+
+    @staticmethod
+    def _extract_equations(latex_content: str) -> List[str]:
+        """Extract all equations."""
+        display, inline = [], []
+        for m in _EQUATION_RE.finditer(latex_content):
+            if m.group(1) is not None:
+                display.append(m.group(1))
+            else:
+                inline.append(m.group(2))
+        return display + inline
+
+    @staticmethod
+    def _extract_citations(latex_content: str) -> List[str]:
+        """Extract all citations."""
+        return _CITATION_RE.findall(latex_content)
+
+    @staticmethod
+    def _extract_environments(latex_content: str) -> List[str]:
+        """Extract LaTeX environments (theorem, proof, etc.)."""
+        return _ENVIRONMENT_RE.findall(latex_content)
+
+    # Generator variants of the extractors, for callers that only iterate once
+
+    @staticmethod
+    def _iter_sections(latex_content: str) -> Iterator[str]:
+        """Yield section titles in source order."""
+        return (m.group(1) for m in _SECTION_RE.finditer(latex_content))
+
+    @staticmethod
+    def _iter_subsections(latex_content: str) -> Iterator[str]:
+        """Yield subsection titles in source order."""
+        return (m.group(1) for m in _SUBSECTION_RE.finditer(latex_content))
+
+    @staticmethod
+    def _iter_equations(latex_content: str) -> Iterator[str]:
+        """Yield display and inline equations interleaved in source order."""
+        return (m.group(1) if m.group(1) is not None else m.group(2)
+                for m in _EQUATION_RE.finditer(latex_content))
+
+    @staticmethod
+    def _iter_citations(latex_content: str) -> Iterator[str]:
+        """Yield citation keys in source order."""
+        return (m.group(1) for m in _CITATION_RE.finditer(latex_content))
+
+    @staticmethod
+    def _iter_environments(latex_content: str) -> Iterator[str]:
+        """Yield environment names in source order."""
+        return (m.group(1) for m in _ENVIRONMENT_RE.finditer(latex_content))
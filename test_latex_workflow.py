@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """Test script demonstrating LaTeX import, parsing, and paragraph-level editing workflow."""
 
+import os
 import sys
+import tempfile
+import genproposal
 from genproposal import ProposalGenerator, LaTeXStructureParser
 import json
 
@@ -20,21 +23,21 @@ def test_basic_parsing():
     print(f"\nTotal paragraphs extracted: {len(paragraphs)}")
     print("\nParagraph summary:")
     for p in paragraphs:
-        section = p['section'] or "(no section)"
-        subsection = f" > {p['subsection']}" if p['subsection'] else ""
-        text_preview = p['paragraph'][:80].replace('\n', ' ') + "..."
-        print(f"  [{p['index']}] {section}{subsection}")
+        section = p.section or "(no section)"
+        subsection = f" > {p.subsection}" if p.subsection else ""
+        text_preview = p.paragraph[:80].replace('\n', ' ') + "..."
+        print(f"  [{p.index}] {section}{subsection}")
         print(f"       {text_preview}")
     
     # Verify structure
     assert len(paragraphs) > 0, "No paragraphs extracted"
     
     # Check that sections are populated
-    with_sections = [p for p in paragraphs if p['section']]
+    with_sections = [p for p in paragraphs if p.section]
     print(f"\nParagraphs with section info: {len(with_sections)}/{len(paragraphs)}")
     
     # Check subsections
-    with_subsections = [p for p in paragraphs if p['subsection']]
+    with_subsections = [p for p in paragraphs if p.subsection]
     print(f"Paragraphs with subsection info: {len(with_subsections)}/{len(paragraphs)}")
     
     print("\n✅ TEST PASSED: LaTeX parsing working correctly\n")
@@ -125,8 +128,8 @@ def test_section_subsection_hierarchy():
     # Find all unique section/subsection combinations
     hierarchy = {}
     for p in paragraphs:
-        sec = p['section'] or "(no section)"
-        subsec = p['subsection'] or "(no subsection)"
+        sec = p.section or "(no section)"
+        subsec = p.subsection or "(no subsection)"
         key = (sec, subsec)
         if key not in hierarchy:
             hierarchy[key] = 0
@@ -140,6 +143,334 @@ def test_section_subsection_hierarchy():
     print("\n✅ TEST PASSED: Hierarchy correctly preserved\n")
 
 
+def test_nested_ignore_blocks():
+    """Test that \\ignore blocks with deeply nested braces are fully removed."""
+    print("=" * 70)
+    print("TEST 6: Nested \\ignore Block Removal")
+    print("=" * 70)
+
+    test_latex = r"Before \ignore{outer {middle {inner} text} end} after \ignore{again} done."
+
+    cleaned = LaTeXStructureParser._remove_ignore_blocks(test_latex)
+    print(f"Original: {test_latex}")
+    print(f"Cleaned:  {cleaned}")
+
+    assert cleaned == "Before  after  done.", "Nested \\ignore block not fully removed"
+
+    print("\n✅ TEST PASSED: nested \\ignore blocks properly removed\n")
+
+
+def test_escaped_braces_in_ignore_blocks():
+    """Test that escaped braces inside \\ignore blocks do not change nesting depth."""
+    print("=" * 70)
+    print("TEST 7: Escaped Braces in \\ignore Blocks")
+    print("=" * 70)
+
+    test_latex = r"Before \ignore{set \{x\} and \} too} after."
+
+    cleaned = LaTeXStructureParser._remove_ignore_blocks(test_latex)
+    print(f"Original: {test_latex}")
+    print(f"Cleaned:  {cleaned}")
+
+    assert cleaned == "Before  after.", "Escaped brace ended the \\ignore block early"
+
+    print("\n✅ TEST PASSED: escaped braces treated as literals\n")
+
+
+def _read_tex(text):
+    """Write text to a temporary .tex file and return read_document's result."""
+    fd, path = tempfile.mkstemp(suffix=".tex")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        return LaTeXStructureParser.read_document(path)
+    finally:
+        os.unlink(path)
+
+
+def test_read_document_slicing():
+    """Test that read_document drops the preamble and trailer only where it is safe."""
+    print("=" * 70)
+    print("TEST 8: Document Slicing in read_document")
+    print("=" * 70)
+
+    preamble = "\\documentclass{article}\n\\usepackage{amsmath}\n"
+    body = "\\section{Intro}\n\nFirst paragraph.\n\nSecond paragraph.\n"
+    full = preamble + "\\begin{document}\n" + body + "\\end{document}\ntrailing notes\n"
+
+    # With markers: preamble and everything after \end{document} are cut
+    sliced = _read_tex(full)
+    print(f"With markers: {sliced!r}")
+    assert sliced.startswith("\\begin{document}"), "Preamble not dropped"
+    assert "trailing notes" not in sliced and "\\end{document}" not in sliced, "Trailer not dropped"
+    assert LaTeXStructureParser.parse_paragraphs(sliced) == LaTeXStructureParser.parse_paragraphs(full), \
+        "Slicing changed the parsed paragraphs"
+
+    # Without \begin{document}: the whole file is kept
+    assert _read_tex(body) == body, "Document without markers was altered"
+
+    # A marker inside an \ignore block must not be used as the cut point
+    tricky = (preamble + "\\ignore{\\begin{document} hidden \\end{document}}\n"
+              + "\\begin{document}\n" + body + "\\end{document}\n")
+    kept = _read_tex(tricky)
+    assert kept == tricky, "Cut made at a marker preceded by an \\ignore block"
+    paragraphs = LaTeXStructureParser.parse_paragraphs(kept)
+    assert [p.paragraph for p in paragraphs] == ["First paragraph.", "Second paragraph."], \
+        "Ignored markers leaked into the parsed paragraphs"
+
+    # Empty file
+    assert _read_tex("") == "", "Empty file should read as an empty string"
+
+    print("\n✅ TEST PASSED: read_document slices only at safe document markers\n")
+
+
+def test_equation_extraction():
+    """Test that each equation is extracted exactly once, and escaped dollars are not math."""
+    print("=" * 70)
+    print("TEST 9: Equation Extraction")
+    print("=" * 70)
+
+    cases = [
+        # display math is not picked up again as inline math
+        (r"Display $$a+b$$ and inline $c$.", ["a+b", "c"]),
+        # escaped dollars are literal text
+        (r"It costs \$5, or \$10 with $x$ shipping.", ["x"]),
+        # a \\ line break before an inline formula does not escape it
+        (r"First line\\$y$", ["y"]),
+        # equations inside other environments are found once
+        (r"\begin{figure}$$f(x)$$\caption{$g$}\end{figure}", ["f(x)", "g"]),
+        (r"\begin{itemize}\item $e=mc^2$\end{itemize}", ["e=mc^2"]),
+        # and so are equations inside a section title
+        (r"\section{On $z$}", ["z"]),
+    ]
+    for latex, expected in cases:
+        structure = LaTeXStructureParser.parse_structure(latex)
+        print(f"{latex!r} -> {structure['equations']}")
+        assert structure["equations"] == expected, f"Wrong equations for {latex!r}"
+        assert LaTeXStructureParser._extract_equations(latex) == expected, \
+            f"_extract_equations disagrees for {latex!r}"
+
+    structure = LaTeXStructureParser.parse_structure(
+        r"\begin{itemize}\item $e=mc^2$ \cite{einstein}\end{itemize}"
+    )
+    assert structure["environments"] == ["itemize"], "Environment not extracted once"
+    assert structure["citations"] == ["einstein"], "Citation not extracted once"
+
+    print("\n✅ TEST PASSED: equations extracted once, escaped dollars ignored\n")
+
+
+def test_json_processing_output():
+    """Test that windowed JSON processing writes complete output, and nothing on failure."""
+    print("=" * 70)
+    print("TEST 10: Windowed JSON Processing Output")
+    print("=" * 70)
+
+    generator = ProposalGenerator(use_cache=False)
+    calls = []
+
+    def fake_batch(items, max_workers):
+        calls.append(len(items))
+        return [f"edited: {item['paragraph']}" for item in items]
+
+    generator.edit_paragraphs_batch = fake_batch
+    items = [{"index": i, "paragraph": f"Paragraph {i}.", "instruction": "tighten"} for i in range(25)]
+    window = genproposal.JSON_EDIT_WINDOW
+    genproposal.JSON_EDIT_WINDOW = 4
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "paragraphs.json")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(items, f)
+
+            result = generator.process_json_instructions(json_path, extract_changes=True)
+            with open(result["processed_json"], encoding="utf-8") as f:
+                processed = json.load(f)
+            with open(result["diffs_json"], encoding="utf-8") as f:
+                diffs = json.load(f)
+            print(f"Edited in windows of sizes {calls}")
+            assert calls == [4, 4, 4, 4, 4, 4, 1], "Input not processed window by window"
+            assert [p["final"] for p in processed] == [f"edited: Paragraph {i}." for i in range(25)], \
+                "Processed output incomplete"
+            assert sorted(diffs, key=int) == [str(i) for i in range(25)], "Diff output incomplete"
+            mode = os.stat(result["processed_json"]).st_mode & 0o777
+            assert mode == 0o666 & ~genproposal._UMASK, f"Output written with mode {oct(mode)}"
+
+            # A failure mid-stream keeps the earlier outputs and leaves no temp files
+            def failing_batch(items, max_workers):
+                if len(calls) >= 8:
+                    raise RuntimeError("LLM unavailable")
+                return fake_batch(items, max_workers)
+
+            generator.edit_paragraphs_batch = failing_batch
+            try:
+                generator.process_json_instructions(json_path, extract_changes=True)
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("Edit failure did not propagate")
+            assert sorted(os.listdir(tmp)) == sorted(
+                ["paragraphs.json", "paragraphs_processed.json", "paragraphs_diffs.json"]
+            ), "Partial or temporary files left behind"
+            with open(result["processed_json"], encoding="utf-8") as f:
+                assert json.load(f) == processed, "Failed run replaced the earlier output"
+    finally:
+        genproposal.JSON_EDIT_WINDOW = window
+
+    print("\n✅ TEST PASSED: JSON outputs are complete or untouched\n")
+
+
+def test_use_case_cache_key():
+    """Test which use cases share a generated-example cache entry."""
+    print("=" * 70)
+    print("TEST 11: Use Case Cache Key")
+    print("=" * 70)
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "code"))
+    from dspyanalysis import _normalize_use_case
+
+    # filler words and the library's own name do not change the request
+    assert _normalize_use_case("FastAPI", "basic setup of FastAPI") == \
+        _normalize_use_case("FastAPI", "Basic setup"), "Rewordings should share a key"
+    # but word order does
+    assert _normalize_use_case("pandas", "read JSON, write CSV") != \
+        _normalize_use_case("pandas", "read CSV, write JSON"), "Different tasks share a key"
+
+    print("\n✅ TEST PASSED: cache key ignores wording but not word order\n")
+
+
+def test_edit_cache():
+    """Test that paragraph edits are cached per model, and not at all without a cache."""
+    print("=" * 70)
+    print("TEST 12: Paragraph Edit Cache")
+    print("=" * 70)
+
+    import dspy
+    from dspy.utils import DummyLM
+
+    lm_a = DummyLM([{"edited_paragraph": "Edited by A."}] * 4)
+    lm_b = DummyLM([{"edited_paragraph": "Edited by B."}] * 4)
+    lm_b.model = "other-model"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = ProposalGenerator(cache_path=os.path.join(tmp, "cache.sqlite"))
+        with dspy.context(lm=lm_a):
+            assert generator._llm_edit("Some text.", "tighten") == "Edited by A."
+            assert generator._llm_edit("Some text.", "tighten") == "Edited by A."
+        assert len(lm_a.history) == 1, "Repeated edit was not served from the cache"
+
+        with dspy.context(lm=lm_b):
+            assert generator._llm_edit("Some text.", "tighten") == "Edited by B.", \
+                "Cached edit from another model was reused"
+        assert len(lm_b.history) == 1, "Model change did not go back to the LLM"
+
+        uncached_path = os.path.join(tmp, "unused.sqlite")
+        uncached = ProposalGenerator(use_cache=False, cache_path=uncached_path)
+        with dspy.context(lm=lm_a):
+            uncached._llm_edit("Some text.", "tighten")
+            uncached._llm_edit("Some text.", "tighten")
+        assert len(lm_a.history) == 3, "use_cache=False still answered from a cache"
+        assert not os.path.exists(uncached_path), "use_cache=False created a cache file"
+
+    print("\n✅ TEST PASSED: edits cached per model, bypassed without a cache\n")
+
+
+def test_history_log_replay():
+    """Test that an unsaved history log is replayed, and emptied once saved."""
+    print("=" * 70)
+    print("TEST 13: Paragraph History Log Replay")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "history.jsonl")
+        snapshot = os.path.join(tmp, "history.json")
+
+        # a session that ends without saving leaves its versions in the log
+        history = genproposal.ParagraphHistory(log_path)
+        history.add_version("Intro", "Version 1")
+        history.add_version("Intro", "Version 2")
+        history.close()
+
+        replayed = genproposal.ParagraphHistory(log_path)
+        assert [v["content"] for v in replayed.get_versions("Intro")] == ["Version 1", "Version 2"], \
+            "Unsaved log not replayed"
+        replayed.save_to_file(snapshot)
+        assert os.path.getsize(log_path) == 0, "Log not emptied after save"
+
+        # the next session starts from the snapshot, not a replay of the log
+        fresh = genproposal.ParagraphHistory(log_path)
+        assert fresh.get_versions("Intro") == [], "Saved versions replayed again"
+        fresh.load_from_file(snapshot)
+        assert len(fresh.get_versions("Intro")) == 2, "Snapshot lost versions"
+
+    print("\n✅ TEST PASSED: log replayed until saved, then emptied\n")
+
+
+def test_history_save_skip():
+    """Test that saving an unchanged history does not rewrite the file."""
+    print("=" * 70)
+    print("TEST 14: Unchanged History Save Skipped")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_a = os.path.join(tmp, "a.json")
+        path_b = os.path.join(tmp, "b.json")
+        history = genproposal.ParagraphHistory()
+        history.add_version("Intro", "Version 1")
+        history.save_to_file(path_a)
+
+        # overwrite the snapshot behind the history's back: a skipped save leaves it alone
+        with open(path_a, "w", encoding="utf-8") as f:
+            f.write("{}")
+        history.save_to_file(path_a)
+        with open(path_a, encoding="utf-8") as f:
+            assert f.read() == "{}", "Unchanged history was written again"
+
+        # saving to another file always writes it
+        history.save_to_file(path_b)
+        assert "Intro" in genproposal.load_json(path_b), "Save to a new file skipped"
+
+        # and a new version makes the next save write
+        history.add_version("Intro", "Version 2")
+        history.save_to_file(path_a)
+        assert len(genproposal.load_json(path_a)["Intro"]) == 2, "Modified history not written"
+
+    print("\n✅ TEST PASSED: only changed histories are written\n")
+
+
+def test_cleaning_matches_reference():
+    """Test single-pass cleaning against the original one-pattern-at-a-time cleanup."""
+    print("=" * 70)
+    print("TEST 15: Cleaning Matches Reference")
+    print("=" * 70)
+
+    import re
+
+    def reference_clean(text):
+        text = re.sub(r'\\(begin|end)\{[^}]*\}', '', text)
+        text = re.sub(r'\\(cite|ref|label)\{[^}]*\}', '', text)
+        text = re.sub(r'\\(textbf|textit|emph|texttt|text|sout|uline)\{([^}]*)\}', r'\2', text)
+        text = re.sub(r'\\(em|it|bf)\b\s*', '', text)
+        text = re.sub(r'\\item\s+', '', text)
+        text = re.sub(r'\$([^$]+)\$', r'[\1]', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    with open("input.tex") as f:
+        chunks = re.split(r'\n\n+', f.read())
+    for chunk in chunks:
+        assert LaTeXStructureParser._clean_paragraph_text(chunk) == reference_clean(chunk), \
+            f"Cleaning differs from reference on: {chunk[:60]!r}"
+    print(f"{len(chunks)} input.tex chunks cleaned identically")
+
+    # kept text is cleaned too, so markup nested in formatting disappears
+    assert LaTeXStructureParser._clean_paragraph_text(r"See \textbf{\cite{x}} here.") == "See here."
+    assert LaTeXStructureParser._clean_paragraph_text(r"A \emph{b \textbf{c}} d.") == "A b c d."
+    # inline math that held only markup leaves nothing behind
+    assert LaTeXStructureParser._clean_paragraph_text(r"x $\it$ y") == "x y"
+    assert LaTeXStructureParser._clean_paragraph_text(r"x $a+b$ y") == "x [a+b] y"
+
+    print("\n✅ TEST PASSED: cleaning matches the reference\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 70)
@@ -152,6 +483,16 @@ def main():
         test_paragraph_cleaning()
         test_history_tracking()
         test_section_subsection_hierarchy()
+        test_nested_ignore_blocks()
+        test_escaped_braces_in_ignore_blocks()
+        test_read_document_slicing()
+        test_equation_extraction()
+        test_json_processing_output()
+        test_use_case_cache_key()
+        test_edit_cache()
+        test_history_log_replay()
+        test_history_save_skip()
+        test_cleaning_matches_reference()
         
         print("=" * 70)
         print("ALL TESTS PASSED ✅")